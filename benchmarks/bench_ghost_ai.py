@@ -0,0 +1,88 @@
+"""Ghost AI micro-benchmark.
+
+Measures:
+- route query cost: node-graph Dijkstra + tile BFS vs. NavigationTable lookups
+- per-frame ghost AI time: Ghost.update() for the four standard ghosts while a
+  scripted Pacman wanders the maze
+
+Run from the project root:
+    python benchmarks/bench_ghost_ai.py [frames]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pygame  # noqa: E402
+
+pygame.init()
+
+import maze  # noqa: E402
+import ghost  # noqa: E402
+from ghost import Ghost, dijkstra, nearest_node_from_tile  # noqa: E402
+from pacman import Pacman  # noqa: E402
+
+maze.init()
+
+
+def bench_route_queries(pairs=2000, seed=0):
+    rng = random.Random(seed)
+    t0 = time.perf_counter()
+    nav = ghost.get_maze_navigation()
+    build_ms = (time.perf_counter() - t0) * 1000
+    nodes, adj = ghost.get_maze_graph()
+    node_list = sorted(nodes)
+    queries = [(rng.choice(node_list), rng.choice(node_list)) for _ in range(pairs)]
+
+    t0 = time.perf_counter()
+    for a, b in queries:
+        dijkstra(adj, a, b)
+        nearest_node_from_tile(b, nodes)
+    dijkstra_us = (time.perf_counter() - t0) / pairs * 1e6
+
+    t0 = time.perf_counter()
+    for a, b in queries:
+        nav.next_node(a, b, nodes)
+        nav.nearest_node(b)
+    table_us = (time.perf_counter() - t0) / pairs * 1e6
+
+    print(f"navigation table build: {build_ms:.1f} ms "
+          f"({nav.size} tiles, {len(nav.dist) * 2 * 2 // 1024} KiB)")
+    print(f"route query: dijkstra+bfs {dijkstra_us:.1f} us, table {table_us:.2f} us "
+          f"({dijkstra_us / table_us:.0f}x)")
+
+
+def bench_ghost_frames(frames=3000, seed=1):
+    random.seed(seed)
+    pacman = Pacman()
+    red = Ghost(color=(255, 0, 0), pacman=pacman, speed=1.1, spawn_values={5}, sprite_variant="red", behavior="blinky")
+    blue = Ghost(color=(0, 0, 255), pacman=pacman, speed=1.1, spawn_values={6}, sprite_variant="blue", behavior="inky", partner=red)
+    orange = Ghost(color=(255, 165, 0), pacman=pacman, speed=1.1, spawn_values={7}, sprite_variant="orenge", behavior="clyde")
+    pink = Ghost(color=(255, 105, 180), pacman=pacman, speed=1.1, spawn_values={8}, sprite_variant="pink", behavior="pinky")
+    ghosts = [red, blue, orange, pink]
+    keys = [pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT]
+    samples = []
+    for frame in range(frames):
+        if frame % 20 == 0:
+            pacman.handle_input(pygame.event.Event(pygame.KEYDOWN, key=random.choice(keys)))
+        pacman.update()
+        t0 = time.perf_counter()
+        for g in ghosts:
+            g.update()
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    mean_us = sum(samples) / len(samples) * 1e6
+    p99_us = samples[int(len(samples) * 0.99)] * 1e6
+    print(f"ghost AI per frame (4 ghosts, {frames} frames): mean {mean_us:.1f} us, p99 {p99_us:.1f} us, "
+          f"max {samples[-1] * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    if hasattr(ghost, "get_maze_navigation"):
+        bench_route_queries()
+    bench_ghost_frames(frames)
@@ -0,0 +1,252 @@
+"""Benchmark suite for pathfinding, rendering and full-frame throughput.
+
+Every maze in data/maze.json is measured in its own subprocess (mazes differ in
+size, and maze.init() fixes the dimensions for the process), using the dummy SDL
+video driver so no window is needed.
+
+Each operation is warmed up, then timed in `--repeat` batches whose size is
+auto-calibrated (timeit.autorange); the report gives min/median/stdev per call.
+
+    python benchmarks/bench_suite.py                              # all mazes, print table
+    python benchmarks/bench_suite.py --save-baseline baseline.json
+    python benchmarks/bench_suite.py --compare baseline.json      # exit 1 on regression
+    python benchmarks/bench_suite.py --maze 4 --only dijkstra
+
+Baselines are machine specific: save and compare on the same hardware.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+SRC = os.path.join(ROOT, "src")
+
+
+def _setup_ops(seed=0):
+    """Import the game for the maze selected via PACMAN_MAZE and return {name: callable}."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    sys.path.insert(0, SRC)
+    import contextlib
+    import io
+
+    import pygame
+    pygame.init()
+    import maze
+    import ghost
+    import headless
+
+    # Open a (dummy) display before the first HeadlessGame so the render ops have a surface
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze.init()
+
+    rng = random.Random(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = headless.HeadlessGame(seed=seed)
+    nodes, adj = ghost.get_maze_graph()
+    node_list = sorted(nodes)
+    walkable = [(x, y) for y in range(maze.MAP_HEIGHT) for x in range(maze.MAP_WIDTH) if ghost.is_walkable(x, y)]
+    non_nodes = [t for t in walkable if t not in nodes] or walkable
+    node_pairs = [(rng.choice(node_list), rng.choice(node_list)) for _ in range(256)]
+    tile_pairs = [(rng.choice(walkable), rng.choice(walkable)) for _ in range(256)]
+    probe_tiles = [rng.choice(non_nodes) for _ in range(256)]
+    probe_ghost = game.ghosts[0]
+
+    def cycle(items):
+        state = {"i": 0}
+
+        def take():
+            state["i"] = (state["i"] + 1) % len(items)
+            return items[state["i"]]
+        return take
+
+    next_node_pair = cycle(node_pairs)
+    next_tile_pair = cycle(tile_pairs)
+    next_probe = cycle(probe_tiles)
+
+    def op_build_graph():
+        ghost.build_graph()
+
+    def op_dijkstra():
+        a, b = next_node_pair()
+        ghost.dijkstra(adj, a, b)
+
+    def op_nearest_node_from_tile():
+        ghost.nearest_node_from_tile(next_probe(), nodes)
+
+    def op_next_tile_towards():
+        a, b = next_tile_pair()
+        probe_ghost._next_tile_towards(a, b)
+
+    same_size_keys = maze.get_same_size_maze_keys()
+    next_maze_key = cycle(same_size_keys)
+
+    def op_load_maze_by_key():
+        maze.load_maze_by_key(next_maze_key())
+
+    def op_draw_smooth_map():
+        maze.draw_smooth_map()
+
+    def op_draw_smooth_map_rebuild():
+        maze.invalidate_map_cache()
+        maze.draw_smooth_map()
+
+    # Ghost cycle and full frame run on their own game so they don't disturb each other
+    with contextlib.redirect_stdout(io.StringIO()):
+        ghost_game = headless.HeadlessGame(seed=seed + 1)
+
+    def op_ghost_update_x4():
+        for g in ghost_game.ghosts:
+            g.update()
+
+    frame_state = {"game": None, "controller": None}
+
+    def op_headless_frame():
+        game_ = frame_state["game"]
+        if game_ is None or game_.is_over():
+            with contextlib.redirect_stdout(io.StringIO()):
+                game_ = frame_state["game"] = headless.HeadlessGame(seed=seed + 2)
+            frame_state["controller"] = headless.RandomController(seed=seed + 2)
+        game_.step(frame_state["controller"](game_))
+
+    return {
+        "build_graph": op_build_graph,
+        "dijkstra": op_dijkstra,
+        "nearest_node_from_tile": op_nearest_node_from_tile,
+        "ghost_next_tile_towards": op_next_tile_towards,
+        "draw_smooth_map": op_draw_smooth_map,
+        "draw_smooth_map_rebuild": op_draw_smooth_map_rebuild,
+        "ghost_update_x4": op_ghost_update_x4,
+        "headless_frame": op_headless_frame,
+        # Last: switching mazes swaps MAP_DATA under the games above
+        "load_maze_by_key": op_load_maze_by_key,
+    }
+
+
+def measure(fn, repeat=7):
+    """Warm up, then time `repeat` auto-sized batches; returns per-call microseconds."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    # autorange targets >= 0.2 s per batch; scale down to keep the suite quick
+    number = max(1, number // 4)
+    # Warm-up batch (caches, lazily built tables) before the timed repeats
+    timer.timeit(number=number)
+    per_call = [t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "min_us": min(per_call),
+        "median_us": statistics.median(per_call),
+        "stdev_us": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run_maze(repeat, only=None):
+    ops = _setup_ops()
+    results = {}
+    for name, fn in ops.items():
+        if only and name not in only:
+            continue
+        results[name] = measure(fn, repeat=repeat)
+    return results
+
+
+def maze_keys():
+    with open(os.path.join(ROOT, "data", "maze.json"), "r", encoding="utf-8") as f:
+        return sorted(json.load(f).keys(), key=int)
+
+
+def run_all(keys, repeat, only=None):
+    results = {}
+    for key in keys:
+        cmd = [sys.executable, os.path.abspath(__file__), "--maze", key, "--repeat", str(repeat), "--raw"]
+        if only:
+            cmd += ["--only", *only]
+        env = dict(os.environ, PACMAN_MAZE=key)
+        out = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True).stdout
+        # The raw JSON is the last line; anything before it is pygame/game chatter
+        results[f"maze:{key}"] = json.loads(out.strip().splitlines()[-1])
+        print(f"maze {key}: done", file=sys.stderr)
+    return results
+
+
+def metadata():
+    try:
+        import pygame
+        pygame_version = pygame.version.ver
+    except Exception:
+        pygame_version = None
+    return {"python": platform.python_version(), "pygame": pygame_version,
+            "platform": platform.platform(), "machine": platform.machine()}
+
+
+def print_table(results):
+    print(f"{'maze':<8}{'operation':<26}{'min us':>12}{'median us':>12}{'stdev':>10}")
+    for maze_name, ops in results.items():
+        for op, r in ops.items():
+            print(f"{maze_name:<8}{op:<26}{r['min_us']:12.2f}{r['median_us']:12.2f}{r['stdev_us']:10.2f}")
+
+
+def compare(results, baseline, tolerance):
+    """Print per-op change vs baseline (median); return the list of regressions."""
+    regressions = []
+    base_results = baseline.get("results", {})
+    for maze_name, ops in results.items():
+        for op, r in ops.items():
+            base = base_results.get(maze_name, {}).get(op)
+            if base is None:
+                continue
+            change = (r["median_us"] - base["median_us"]) / base["median_us"]
+            flag = ""
+            if change > tolerance:
+                flag = "  REGRESSION"
+                regressions.append((maze_name, op, change))
+            print(f"{maze_name:<8}{op:<26}{base['median_us']:12.2f} -> {r['median_us']:10.2f} us  {change:+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pacman performance benchmarks.")
+    parser.add_argument("--maze", help="benchmark a single maze key")
+    parser.add_argument("--only", nargs="+", help="only run these operations")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--raw", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--save-baseline", metavar="PATH", help="write results to a baseline JSON")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.20,
+                        help="allowed median slowdown before flagging a regression (default 0.20 = 20%%)")
+    args = parser.parse_args()
+
+    if args.raw:
+        print(json.dumps(run_maze(args.repeat, args.only)))
+        return 0
+
+    keys = [args.maze] if args.maze else maze_keys()
+    results = run_all(keys, args.repeat, args.only)
+    print_table(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"meta": metadata(), "results": results}, f, indent=4)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print()
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.tolerance:.0%}")
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Swarm mode benchmark: full frame cost for growing ghost counts.
+
+Each frame runs one simulation step (Pacman, every ghost, collisions) and the
+game's dirty-rect render (map restore, sprites, lives, display update) with the
+dummy SDL video driver, so it measures CPU cost without vsync. A count is
+sustainable at 60 FPS when its p99 frame time fits in 16.7 ms; the run stops at
+the first count that does not.
+
+Run from the project root:
+    python benchmarks/bench_swarm.py [--maze 1] [--frames 1200] [--counts 4 16 64 256]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pygame  # noqa: E402
+
+FRAME_BUDGET_MS = 1000 / 60
+DEFAULT_COUNTS = [4, 16, 64, 128, 256, 512, 1024, 2048]
+
+
+def bench_count(count, frames, seed=1):
+    """Return sorted per-frame times (ms) for `frames` frames with `count` ghosts."""
+    import maze
+    import headless
+
+    def new_game():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return headless.HeadlessGame(seed=seed, initial_lives=3, ghost_count=count)
+
+    game = new_game()
+    controller = headless.RandomController(seed=seed)
+    prev_dirty = []
+    maze.draw_smooth_map()
+    pygame.display.flip()
+    samples = []
+    while len(samples) < frames:
+        if game.is_over():
+            # New games are not timed
+            game = new_game()
+            maze.draw_smooth_map()
+            pygame.display.flip()
+            prev_dirty = []
+        t0 = time.perf_counter()
+        game.step(controller(game))
+        if maze.map_cache_stale():
+            maze.draw_smooth_map()
+        else:
+            maze.restore_map_regions(prev_dirty)
+        dirty = game.pacman.draw()
+        for g in game.ghosts:
+            dirty += g.draw()
+        dirty += game.level.draw_lives()
+        pygame.display.update(prev_dirty + dirty)
+        prev_dirty = dirty
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Swarm mode frame-time benchmark.")
+    parser.add_argument("--maze", default="1", help="maze key")
+    parser.add_argument("--frames", type=int, default=1200, help="timed frames per ghost count")
+    parser.add_argument("--counts", type=int, nargs="+", default=DEFAULT_COUNTS)
+    args = parser.parse_args()
+
+    pygame.init()
+    import maze
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze.init(args.maze)
+
+    print(f"maze {args.maze}, {args.frames} frames per count, budget {FRAME_BUDGET_MS:.1f} ms")
+    print(f"{'ghosts':>8}{'mean ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    sustainable = None
+    for count in args.counts:
+        samples = bench_count(count, args.frames)
+        mean = sum(samples) / len(samples)
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        print(f"{count:>8}{mean:10.2f}{p99:10.2f}{samples[-1]:10.2f}")
+        if p99 > FRAME_BUDGET_MS:
+            break
+        sustainable = count
+    print(f"max sustainable at 60 FPS: {sustainable if sustainable is not None else 'none'} ghosts")
+
+
+if __name__ == "__main__":
+    main()
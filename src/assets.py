@@ -0,0 +1,95 @@
+# assets.py
+"""Sprite atlas shared by all actors.
+
+Every PNG under assets/sprites is decoded once. For each sprite size in use the
+images are smoothscaled once and packed side by side into one sheet, and callers
+get subsurfaces of that sheet, so the four ghosts share one scatter sprite instead
+of each decoding and scaling its own copy.
+
+    image = get_sprite("Ghost-red.png", TILE_SIZE - 2)
+
+Generated animations (e.g. Pacman's mouth frames) are packed the same way with
+get_frames(key, build).
+
+Needs a display surface (convert_alpha), so don't call it when running headless.
+"""
+import os
+
+import pygame
+
+from paths import resource_path
+
+SPRITE_DIR = resource_path("assets", "sprites")
+
+
+class SpriteAtlas:
+    def __init__(self, sprite_dir=SPRITE_DIR):
+        self.sprite_dir = sprite_dir
+        self._images = None
+        # size -> {name: subsurface}
+        self._sheets = {}
+        # key -> [subsurface] for generated animation frames
+        self._frame_sheets = {}
+
+    def _load_images(self):
+        """Decode every PNG in the sprite directory (once)."""
+        self._images = {}
+        for name in sorted(os.listdir(self.sprite_dir)):
+            if not name.lower().endswith(".png"):
+                continue
+            try:
+                self._images[name] = pygame.image.load(os.path.join(self.sprite_dir, name)).convert_alpha()
+            except Exception as e:
+                print(f"Failed to load sprite {name}:", e)
+
+    def _build_sheet(self, size):
+        """Scale every sprite to size x size and pack them into one sheet."""
+        if self._images is None:
+            self._load_images()
+        names = list(self._images)
+        sheet = pygame.Surface((max(1, size * len(names)), size), pygame.SRCALPHA)
+        sprites = {}
+        for i, name in enumerate(names):
+            scaled = pygame.transform.smoothscale(self._images[name], (size, size))
+            # RGBA_MAX onto the transparent sheet copies pixels exactly (no alpha blending)
+            sheet.blit(scaled, (i * size, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            sprites[name] = sheet.subsurface((i * size, 0, size, size))
+        self._sheets[size] = sprites
+        return sprites
+
+    def sprite(self, name, size):
+        """The sprite file `name` scaled to size x size (a shared subsurface: don't draw on it)."""
+        sprites = self._sheets.get(size)
+        if sprites is None:
+            sprites = self._build_sheet(size)
+        if name not in sprites:
+            raise KeyError(f"No sprite named {name} in {self.sprite_dir}")
+        return sprites[name]
+
+    def frames(self, key, build):
+        """Generated frames cached under key: build() is called once and its surfaces packed into one sheet."""
+        frames = self._frame_sheets.get(key)
+        if frames is None:
+            surfaces = build()
+            width = sum(surf.get_width() for surf in surfaces)
+            height = max(surf.get_height() for surf in surfaces)
+            sheet = pygame.Surface((max(1, width), max(1, height)), pygame.SRCALPHA)
+            frames = []
+            x = 0
+            for surf in surfaces:
+                sheet.blit(surf, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+                frames.append(sheet.subsurface((x, 0, surf.get_width(), surf.get_height())))
+                x += surf.get_width()
+            self._frame_sheets[key] = frames
+        return frames
+
+
+ATLAS = SpriteAtlas()
+
+
+def get_sprite(name, size):
+    return ATLAS.sprite(name, size)
+
+
+def get_frames(key, build):
+    return ATLAS.frames(key, build)
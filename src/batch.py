@@ -0,0 +1,138 @@
+# batch.py
+"""Play many headless games in parallel and report score/level/death statistics.
+
+Each game gets its own seed (base seed + game index), so any single game can be
+reproduced with `python src/headless.py --seed <seed> --controller <name>`
+plus the same `--ghost-speed`, `--lives` and `--frames <max-frames>` values,
+regardless of how games were spread over worker processes.
+
+Usage:
+    python src/batch.py --games 1000 --ghost-speed 1.3 --lives 5 --json report.json --csv games.csv
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import headless
+from main import GHOST_SPEED, INITIAL_LIVES
+
+CSV_FIELDS = ["game", "seed", "controller", "ghost_speed", "initial_lives",
+              "score", "level", "lives", "deaths", "game_over", "frames"]
+
+
+def play_game(job: dict) -> dict:
+    """Worker entry point: play one game described by job and return its result row."""
+    # Silence per-game diagnostics (e.g. Pacman's start tile) so stdout stays readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = headless.HeadlessGame(ghost_speed=job["ghost_speed"], initial_lives=job["initial_lives"], seed=job["seed"])
+        controller = headless.CONTROLLERS[job["controller"]](seed=job["seed"])
+        result = game.run(controller, job["max_frames"])
+    row = {key: job[key] for key in ("game", "seed", "controller", "ghost_speed", "initial_lives")}
+    row.update(result)
+    return row
+
+
+def run_batch(games, workers=None, base_seed=0, ghost_speed=GHOST_SPEED, initial_lives=INITIAL_LIVES,
+              controller="random", max_frames=36000):
+    """Play `games` headless games across a process pool; returns result rows in game order."""
+    jobs = [
+        {
+            "game": i,
+            "seed": base_seed + i,
+            "controller": controller,
+            "ghost_speed": ghost_speed,
+            "initial_lives": initial_lives,
+            "max_frames": max_frames,
+        }
+        for i in range(games)
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [play_game(job) for job in jobs]
+    # Several games per task keeps IPC overhead low; games are independent, so
+    # throughput scales with the number of cores
+    chunksize = max(1, games // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(play_game, jobs, chunksize=chunksize))
+
+
+def summarize(rows) -> dict:
+    """Aggregate per-game rows into score, level and death statistics."""
+    if not rows:
+        return {"games": 0}
+    scores = [r["score"] for r in rows]
+    levels = [r["level"] for r in rows]
+    deaths = [r["deaths"] for r in rows]
+    level_counts = {}
+    for lvl in levels:
+        level_counts[str(lvl)] = level_counts.get(str(lvl), 0) + 1
+    return {
+        "games": len(rows),
+        "score_mean": statistics.mean(scores),
+        "score_median": statistics.median(scores),
+        "score_stdev": statistics.pstdev(scores),
+        "score_max": max(scores),
+        "level_mean": statistics.mean(levels),
+        "level_max": max(levels),
+        "levels_reached": dict(sorted(level_counts.items(), key=lambda kv: int(kv[0]))),
+        "deaths_mean": statistics.mean(deaths),
+        "game_over_rate": sum(1 for r in rows if r["game_over"]) / len(rows),
+        "frames_mean": statistics.mean(r["frames"] for r in rows),
+    }
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(path, config, summary, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"config": config, "summary": summary, "games": rows}, f, indent=4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many headless Pacman games in parallel.")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed; game i uses seed + i")
+    parser.add_argument("--ghost-speed", type=float, default=GHOST_SPEED)
+    parser.add_argument("--lives", type=int, default=INITIAL_LIVES)
+    parser.add_argument("--controller", choices=sorted(headless.CONTROLLERS), default="random")
+    parser.add_argument("--max-frames", type=int, default=36000, help="per-game frame limit (60 frames = 1 game second)")
+    parser.add_argument("--csv", help="write one row per game to this CSV file")
+    parser.add_argument("--json", help="write config, summary and per-game rows to this JSON file")
+    args = parser.parse_args()
+
+    config = {
+        "games": args.games,
+        "seed": args.seed,
+        "controller": args.controller,
+        "ghost_speed": args.ghost_speed,
+        "initial_lives": args.lives,
+        "max_frames": args.max_frames,
+    }
+    start = time.perf_counter()
+    rows = run_batch(args.games, workers=args.workers, base_seed=args.seed, ghost_speed=args.ghost_speed,
+                     initial_lives=args.lives, controller=args.controller, max_frames=args.max_frames)
+    elapsed = time.perf_counter() - start
+    summary = summarize(rows)
+    summary["elapsed_s"] = elapsed
+
+    if args.csv:
+        write_csv(args.csv, rows)
+    if args.json:
+        write_json(args.json, config, summary, rows)
+    print(json.dumps(summary, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,36 +3,35 @@ import random
 import math
 import heapq
 import os
-from maze import MAP_DATA, MAP_WIDTH, MAP_HEIGHT, TILE_SIZE, screen
-from paths import resource_path
+from operator import attrgetter
+import maze
+from maze import MAP_DATA, TILE_SIZE, MOVE_TABLE
+from ghoststate import GhostState, NO_DEADLINE, NO_TILE
+from navigation import NavigationTable
+from profiler import PROFILER
+from assets import get_sprite
+
+try:
+    import numpy as np
+except ImportError:  # optional: without NumPy every ghost takes the per-ghost update
+    np = None
 
 WALL = 1
 WALKABLE = {0, 2, 3, 5, 6, 7, 8, 9}
+# Swarms at least this large move their cruising ghosts in one vectorized step;
+# below it the fixed cost of the array operations outweighs the savings
+BATCH_MIN_GHOSTS = 16
 
 
 def is_walkable(x: int, y: int) -> bool:
-    return 0 <= x < MAP_WIDTH and 0 <= y < MAP_HEIGHT and MAP_DATA[y][x] != WALL
-
-
-def neighbors_with_tunnel(x: int, y: int):
-    # Standard neighbors
-    dirs = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-    for dx, dy in dirs:
-        nx, ny = x + dx, y + dy
-        # Tunnel wrap on row 9 across left/right edges
-        if y == 9 and ny == 9 and (nx < 0 or nx >= MAP_WIDTH):
-            if nx < 0:
-                nx = MAP_WIDTH - 1
-            elif nx >= MAP_WIDTH:
-                nx = 0
-        if is_walkable(nx, ny):
-            yield nx, ny
+    return 0 <= x < maze.MAP_WIDTH and 0 <= y < maze.MAP_HEIGHT and MAP_DATA[y][x] != WALL
 
 
 def is_corner_or_junction(x: int, y: int) -> bool:
     if not is_walkable(x, y):
         return False
-    nbs = list(neighbors_with_tunnel(x, y))
+    # Walkable neighbors (tunnels included) from the maze's move table
+    nbs = MOVE_TABLE.neighbors(x, y)
     n = len(nbs)
     if n != 2:
         return n > 0  # dead-end (1) or junction (>=3) are nodes
@@ -45,15 +44,14 @@ def is_corner_or_junction(x: int, y: int) -> bool:
 
 def build_graph():
     nodes = set()
-    for y in range(MAP_HEIGHT):
-        for x in range(MAP_WIDTH):
+    for y in range(maze.MAP_HEIGHT):
+        for x in range(maze.MAP_WIDTH):
             if is_corner_or_junction(x, y):
                 nodes.add((x, y))
     # Ensure tunnel endpoints are nodes (helps with wrapping)
-    if is_walkable(0, 9):
-        nodes.add((0, 9))
-    if is_walkable(MAP_WIDTH - 1, 9):
-        nodes.add((MAP_WIDTH - 1, 9))
+    for y in MOVE_TABLE.tunnel_rows:
+        nodes.add((0, y))
+        nodes.add((maze.MAP_WIDTH - 1, y))
 
     # Build adjacency by ray-casting from each node in 4 directions until next node
     adj = {n: [] for n in nodes}
@@ -62,17 +60,12 @@ def build_graph():
         cx, cy = x, y
         dist = 0
         while True:
-            nx, ny = cx + dx, cy + dy
-            # Tunnel wrap on row 9 across edges
-            if ny == 9 and (nx < 0 or nx >= MAP_WIDTH):
-                if nx < 0:
-                    nx = MAP_WIDTH - 1
-                elif nx >= MAP_WIDTH:
-                    nx = 0
-            if not is_walkable(nx, ny):
+            # One step (wrapping through tunnels); None when blocked
+            nxt = MOVE_TABLE.step(cx, cy, dx, dy)
+            if nxt is None:
                 return None
             dist += 1
-            cx, cy = nx, ny
+            cx, cy = nxt
             if (cx, cy) in nodes:
                 return (cx, cy, dist)
 
@@ -86,14 +79,51 @@ def build_graph():
                     adj[(x, y)].append(((nx, ny), w))
 
     # Make edges symmetric (some directions may not be found from the other node if blocked)
+    linked = {u: {v for v, _ in vs} for u, vs in adj.items()}
     for u in list(adj.keys()):
         for v, w in adj[u]:
-            if u not in [n for n, _ in adj.get(v, [])]:
+            back = linked.setdefault(v, set())
+            if u not in back:
                 adj.setdefault(v, []).append((u, w))
+                back.add(u)
 
     return nodes, adj
 
 
+# Navigation graphs keyed by maze key. Walls never change within a maze, so all
+# ghosts share one graph per layout; eaten pellets do not affect walkability.
+_graph_cache = {}
+
+
+def get_maze_graph():
+    """Return the shared (nodes, adj) graph for the current maze, building it once per key.
+
+    The returned structures are shared between ghosts and must not be mutated.
+    """
+    key = maze.CURRENT_MAZE_KEY
+    graph = _graph_cache.get(key)
+    if graph is None:
+        graph = build_graph()
+        _graph_cache[key] = graph
+    return graph
+
+
+# All-pairs routing tables keyed by maze key, built alongside the shared graph
+_navigation_cache = {}
+
+
+def get_maze_navigation():
+    """Return the shared NavigationTable for the current maze, building it once per key."""
+    key = maze.CURRENT_MAZE_KEY
+    nav = _navigation_cache.get(key)
+    if nav is None:
+        nodes, _ = get_maze_graph()
+        tiles = [(x, y) for y in range(maze.MAP_HEIGHT) for x in range(maze.MAP_WIDTH) if is_walkable(x, y)]
+        nav = NavigationTable(maze.MAP_WIDTH, maze.MAP_HEIGHT, tiles, MOVE_TABLE.neighbors, nodes)
+        _navigation_cache[key] = nav
+    return nav
+
+
 def nearest_node_from_tile(tile, nodes):
     """Return the nearest graph node by BFS expanding along walkable tiles."""
     tx, ty = tile
@@ -106,7 +136,7 @@ def nearest_node_from_tile(tile, nodes):
     seen = { (tx, ty) }
     while dq:
         x, y = dq.popleft()
-        for nx, ny in neighbors_with_tunnel(x, y):
+        for nx, ny in MOVE_TABLE.neighbors(x, y):
             if (nx, ny) in seen:
                 continue
             if (nx, ny) in nodes:
@@ -148,9 +178,103 @@ def dijkstra(adj, start, goal):
     return path
 
 
+def _column(name):
+    """Property backed by this ghost's row in GhostState column `name`."""
+    column = attrgetter(name)
+
+    def get(self):
+        return column(self._state)[self._row]
+
+    def set(self, value):
+        column(self._state)[self._row] = value
+    return property(get, set)
+
+
+def _flag_column(name):
+    """Boolean property stored as 0/1 in GhostState column `name`."""
+    column = attrgetter(name)
+
+    def get(self):
+        return column(self._state)[self._row] != 0
+
+    def set(self, value):
+        column(self._state)[self._row] = 1 if value else 0
+    return property(get, set)
+
+
+def _axis_aligned(px, py, dx, dy, speed):
+    """Position nudged toward the tile center on the axis orthogonal to (dx, dy)."""
+    center = TILE_SIZE // 2
+    corr = max(0.4, min(1.0, speed * 0.5))
+    if dx != 0 and dy == 0:
+        desired = int(py // TILE_SIZE) * TILE_SIZE + center
+        diff = desired - py
+        if abs(diff) <= 1:
+            py = desired
+        else:
+            py += math.copysign(min(abs(diff), corr), diff)
+    elif dy != 0 and dx == 0:
+        desired = int(px // TILE_SIZE) * TILE_SIZE + center
+        diff = desired - px
+        if abs(diff) <= 1:
+            px = desired
+        else:
+            px += math.copysign(min(abs(diff), corr), diff)
+    return px, py
+
+
 class Ghost:
-    def __init__(self, color=(255, 0, 0), pacman=None, speed=2, spawn_values=None, sprite_variant: str = "red", behavior: str = "blinky", partner=None):
+    # Per-ghost state that is not stored in the shared GhostState columns
+    __slots__ = (
+        "_state", "_row", "color", "_rng", "_clock", "pacman", "return_speed", "radius",
+        "image", "scatter_image", "spawn_values", "sprite_variant", "behavior",
+        "_profile_path_stage", "_profile_move_stage", "partner", "home_corner_node",
+        "_wrap_cooldown_until", "nodes", "adj", "nav", "spawn_tile", "nodes_return",
+        "current_target_node", "path_nodes", "last_safe_tile",
+    )
+
+    px = _column("px")
+    py = _column("py")
+    # Position at the previous simulation step (for render interpolation)
+    prev_px = _column("prev_px")
+    prev_py = _column("prev_py")
+    dx = _column("dx")
+    dy = _column("dy")
+    speed = _column("speed")
+    normal_speed = _column("normal_speed")
+    scatter_active = _flag_column("scatter_active")
+    returning_to_base = _flag_column("returning_to_base")
+    _last_move_ms = _column("last_move_ms")
+
+    @property
+    def _scatter_until_ms(self):
+        until = self._state.scatter_until_ms[self._row]
+        return None if until == NO_DEADLINE else until
+
+    @_scatter_until_ms.setter
+    def _scatter_until_ms(self, value):
+        self._state.scatter_until_ms[self._row] = NO_DEADLINE if value is None else value
+
+    @property
+    def _last_pac_tile(self):
+        x = self._state.last_pac_x[self._row]
+        return None if x == NO_TILE else (x, self._state.last_pac_y[self._row])
+
+    @_last_pac_tile.setter
+    def _last_pac_tile(self, tile):
+        x, y = (NO_TILE, NO_TILE) if tile is None else tile
+        self._state.last_pac_x[self._row] = x
+        self._state.last_pac_y[self._row] = y
+
+    def __init__(self, color=(255, 0, 0), pacman=None, speed=2, spawn_values=None, sprite_variant: str = "red", behavior: str = "blinky", partner=None, clock=None, rng=None, state=None):
+        # Row in the (possibly shared) column store for positions, directions, speeds and flags
+        self._state = state if state is not None else GhostState()
+        self._row = self._state.add_row(self)
         self.color = color
+        # Random source for spawn choice and scatter duration (seeded Random for reproducible runs)
+        self._rng = rng if rng is not None else random
+        # Millisecond tick source for timers; injectable so headless runs can use a simulated clock
+        self._clock = clock if clock is not None else pygame.time.get_ticks
         self.pacman = pacman
         self.speed = speed
         self.normal_speed = speed
@@ -165,6 +289,9 @@ class Ghost:
         self.spawn_values = set(spawn_values) if spawn_values is not None else {5}
         self.sprite_variant = sprite_variant
         self.behavior = behavior  # 'blinky' for aggressive chase by default
+        # Profiler stage names for this ghost's update split
+        self._profile_path_stage = f"ghost.{behavior}.path"
+        self._profile_move_stage = f"ghost.{behavior}.move"
         self._last_pac_tile = None  # track pacman tile to trigger re-path
         # Optional partner ghost reference (used by Inky behavior)
         self.partner = partner
@@ -173,44 +300,40 @@ class Ghost:
         # Tunnel wrap cooldown to avoid rapid re-wrap flicker
         self._wrap_cooldown_until = 0
         # Movement idle guard
-        self._last_move_ms = pygame.time.get_ticks()
+        self._last_move_ms = self._clock()
 
-        # Build graph once
-        self.nodes, self.adj = build_graph()
+        # Shared graph and routing tables for the current maze (built once per maze key)
+        self.nodes, self.adj = get_maze_graph()
+        self.nav = get_maze_navigation()
 
-        # Load ghost sprite for the selected variant if available
-        try:
-            sprite_filename = f"Ghost-{self.sprite_variant}.png"
-            sprite_path = resource_path("assets", "sprites", sprite_filename)
-            img = pygame.image.load(sprite_path).convert_alpha()
-            # Scale to a tile size with a tiny padding so it fits corridors
-            size = max(1, TILE_SIZE - 2)
-            self.image = pygame.transform.smoothscale(img, (size, size))
-            scatter_path = resource_path("assets", "sprites", "scater_mode.png")
-            s_img = pygame.image.load(scatter_path).convert_alpha()
-            self.scatter_image = pygame.transform.smoothscale(s_img, (size, size))
-        except Exception as e:
-            # Fallback: keep drawing a circle if sprite fails to load
-            print("Failed to load ghost sprite:", e)
+        # Load ghost sprite for the selected variant if available (nothing to draw when headless)
+        if maze.screen is not None:
+            try:
+                # Scale to a tile size with a tiny padding so it fits corridors;
+                # the atlas decodes and scales each sprite once for all ghosts
+                size = max(1, TILE_SIZE - 2)
+                self.image = get_sprite(f"Ghost-{self.sprite_variant}.png", size)
+                self.scatter_image = get_sprite("scater_mode.png", size)
+            except Exception as e:
+                # Fallback: keep drawing a circle if sprite fails to load
+                print("Failed to load ghost sprite:", e)
 
         # Choose a spawn among configured spawn values
-        spawn_tiles = []
-        for y in range(MAP_HEIGHT):
-            for x in range(MAP_WIDTH):
-                if MAP_DATA[y][x] in self.spawn_values:
-                    spawn_tiles.append((x, y))
+        spawn_tiles = maze.tiles_with_value(*sorted(self.spawn_values))
         if not spawn_tiles:
             # Fallback: center of map
-            spawn = (MAP_WIDTH // 2, MAP_HEIGHT // 2)
+            spawn = (maze.MAP_WIDTH // 2, maze.MAP_HEIGHT // 2)
         else:
-            spawn = random.choice(spawn_tiles)
+            spawn = self._rng.choice(spawn_tiles)
         self.spawn_tile = spawn
 
-        # Build a return graph that includes the spawn tile as a node
-        self.nodes_return, self.adj_return = self._build_return_graph()
+        # Return routing treats the spawn tile as an extra node
+        self.nodes_return = self.nodes | {self.spawn_tile}
 
         self.px = spawn[0] * TILE_SIZE + TILE_SIZE // 2
         self.py = spawn[1] * TILE_SIZE + TILE_SIZE // 2
+        self.prev_px, self.prev_py = self.px, self.py
+        self._refile()
 
         self.dx = 0
         self.dy = 0
@@ -229,9 +352,9 @@ class Ghost:
             if (stx, sty) in self.nodes:
                 # Compute an initial path toward the chase target and take the first step
                 target_node = self._select_chase_target_node()
-                path = dijkstra(self.adj, (stx, sty), target_node)
-                if len(path) >= 2:
-                    self.current_target_node = path[1]
+                next_node = self.nav.next_node((stx, sty), target_node, self.nodes)
+                if next_node is not None:
+                    self.current_target_node = next_node
                     self.choose_next_direction_to(self.current_target_node)
                 else:
                     # Fallback: step toward raw target tile
@@ -249,8 +372,8 @@ class Ghost:
         # Activate scatter for 5–8 seconds
         self.scatter_active = True
         self.returning_to_base = False
-        now = pygame.time.get_ticks()
-        duration_ms = random.randint(5000, 8000)
+        now = self._clock()
+        duration_ms = self._rng.randint(5000, 8000)
         self._scatter_until_ms = now + duration_ms
 
     def take_down_and_return_to_base(self):
@@ -266,6 +389,7 @@ class Ghost:
     def reset_to_spawn(self):
         self.px = self.spawn_tile[0] * TILE_SIZE + TILE_SIZE // 2
         self.py = self.spawn_tile[1] * TILE_SIZE + TILE_SIZE // 2
+        self.prev_px, self.prev_py = self.px, self.py
         self.dx, self.dy = 0, 0
         self.current_target_node = None
         self.path_nodes = []
@@ -274,31 +398,44 @@ class Ghost:
         self.scatter_active = False
         self._plan_move_from_non_node()
         self.last_safe_tile = self.spawn_tile
+        self._refile()
 
     def on_map_changed(self):
         """Rebuild pathfinding graph and spawn for a new maze layout."""
-        # Rebuild nodes/graph for current MAP_DATA
-        self.nodes, self.adj = build_graph()
-        # Recompute spawn tile from current MAP_DATA using configured spawn_values
-        spawn_tiles = []
-        for y in range(MAP_HEIGHT):
-            for x in range(MAP_WIDTH):
-                if MAP_DATA[y][x] in self.spawn_values:
-                    spawn_tiles.append((x, y))
+        # Pick up the shared graph and routing tables for the newly loaded maze
+        self.nodes, self.adj = get_maze_graph()
+        self.nav = get_maze_navigation()
+        # Recompute spawn tile for the new layout using configured spawn_values
+        spawn_tiles = maze.tiles_with_value(*sorted(self.spawn_values))
         if spawn_tiles:
-            self.spawn_tile = random.choice(spawn_tiles)
+            self.spawn_tile = self._rng.choice(spawn_tiles)
         else:
-            self.spawn_tile = (MAP_WIDTH // 2, MAP_HEIGHT // 2)
-        # Rebuild return graph and reset
-        self.nodes_return, self.adj_return = self._build_return_graph()
+            self.spawn_tile = (maze.MAP_WIDTH // 2, maze.MAP_HEIGHT // 2)
+        # Rebuild return nodes and reset
+        self.nodes_return = self.nodes | {self.spawn_tile}
+        # Clyde's home corner belongs to the old layout
+        self.home_corner_node = None
         self.reset_to_spawn()
 
     def current_tile(self):
-        return int(self.px // TILE_SIZE), int(self.py // TILE_SIZE)
+        st, i = self._state, self._row
+        return int(st.px[i] // TILE_SIZE), int(st.py[i] // TILE_SIZE)
+
+    def render_pos(self, alpha=1.0):
+        """Position blended between the previous and current simulation step.
+
+        Jumps larger than a tile (tunnel wrap, respawn) are not blended.
+        """
+        dx = self.px - self.prev_px
+        dy = self.py - self.prev_py
+        if alpha >= 1.0 or abs(dx) > TILE_SIZE or abs(dy) > TILE_SIZE:
+            return self.px, self.py
+        return self.prev_px + dx * alpha, self.prev_py + dy * alpha
 
     def at_tile_center(self):
-        cx = (self.px % TILE_SIZE)
-        cy = (self.py % TILE_SIZE)
+        st, i = self._state, self._row
+        cx = (st.px[i] % TILE_SIZE)
+        cy = (st.py[i] % TILE_SIZE)
         center = TILE_SIZE // 2
         return abs(cx - center) <= 1 and abs(cy - center) <= 1
 
@@ -309,55 +446,74 @@ class Ghost:
 
     def _align_to_axis_center(self):
         """Gently align orthogonal axis to tile center to avoid visual jumps."""
-        tx, ty = self.current_tile()
+        st, i = self._state, self._row
+        st.px[i], st.py[i] = _axis_aligned(st.px[i], st.py[i], st.dx[i], st.dy[i], st.speed[i])
+
+    def _cruise(self):
+        """Fast path of update() for a ghost moving through the middle of a tile.
+
+        Uses the same test as the vectorized _cruise_step: returns False without
+        changing anything unless update() would only move and align this ghost.
+        """
+        st, i = self._state, self._row
+        if st.returning_to_base[i]:
+            return False
+        dx, dy = st.dx[i], st.dy[i]
+        if dx == 0 and dy == 0:
+            return False
+        px, py = st.px[i], st.py[i]
         center = TILE_SIZE // 2
-        corr = max(0.4, min(1.0, self.speed * 0.5))
-        if self.dx != 0 and self.dy == 0:
-            desired = ty * TILE_SIZE + center
-            diff = desired - self.py
-            if abs(diff) <= 1:
-                self.py = desired
-            else:
-                self.py += math.copysign(min(abs(diff), corr), diff)
-        elif self.dy != 0 and self.dx == 0:
-            desired = tx * TILE_SIZE + center
-            diff = desired - self.px
-            if abs(diff) <= 1:
-                self.px = desired
-            else:
-                self.px += math.copysign(min(abs(diff), corr), diff)
+        if abs(px % TILE_SIZE - center) <= 1 and abs(py % TILE_SIZE - center) <= 1:
+            return False
+        now = self._clock()
+        scatter = st.scatter_active[i]
+        if scatter and now >= st.scatter_until_ms[i]:
+            return False
+        tx, ty = int(px // TILE_SIZE), int(py // TILE_SIZE)
+        tunnel_rows = MOVE_TABLE.tunnel_rows
+        if ty in tunnel_rows:
+            return False
+        pac_tile = None
+        if not scatter and self.pacman is not None:
+            pac_tile = (int(self.pacman.px // TILE_SIZE), int(self.pacman.py // TILE_SIZE))
+            if pac_tile[0] == st.last_pac_x[i] and pac_tile[1] == st.last_pac_y[i]:
+                pac_tile = None
+            elif (tx, ty) in self.nodes:
+                # Pacman changed tiles while we stand on a node: update() re-paths
+                return False
+        speed = st.speed[i]
+        next_px = px + dx * speed
+        next_py = py + dy * speed
+        next_tx, next_ty = int(next_px // TILE_SIZE), int(next_py // TILE_SIZE)
+        if next_ty in tunnel_rows or not is_walkable(next_tx, next_ty):
+            return False
+        st.prev_px[i], st.prev_py[i] = px, py
+        # Aligned after the move and again after the (no-op) tunnel check, as in update()
+        next_px, next_py = _axis_aligned(next_px, next_py, dx, dy, speed)
+        st.px[i], st.py[i] = _axis_aligned(next_px, next_py, dx, dy, speed)
+        st.last_move_ms[i] = now
+        if pac_tile is not None:
+            st.last_pac_x[i], st.last_pac_y[i] = pac_tile
+        # Alignment never leaves the tile, so the ghost now stands on the next tile
+        if next_tx != st.tile_x[i] or next_ty != st.tile_y[i]:
+            st.file_row(i, (next_tx, next_ty))
+        return True
+
+    def _refile(self):
+        """Move this ghost to its current tile's bucket in the state's tile index."""
+        st, i = self._state, self._row
+        tx, ty = self.current_tile()
+        if tx != st.tile_x[i] or ty != st.tile_y[i]:
+            st.file_row(i, (tx, ty))
 
     def _next_tile_to_nearest_node(self, start_tile):
-        # BFS over walkable tiles to find nearest graph node and return next step from start
-        from collections import deque
-        sx, sy = start_tile
-        if (sx, sy) in self.nodes:
+        # Next step from start toward the nearest graph node (table lookup, no BFS)
+        if start_tile in self.nodes:
             return None
-        dq = deque()
-        dq.append((sx, sy))
-        parent = { (sx, sy): None }
-        seen = { (sx, sy) }
-        while dq:
-            x, y = dq.popleft()
-            for nx, ny in neighbors_with_tunnel(x, y):
-                if (nx, ny) in seen:
-                    continue
-                parent[(nx, ny)] = (x, y)
-                if (nx, ny) in self.nodes:
-                    # reconstruct path from start to this node
-                    path = [(nx, ny)]
-                    cur = (nx, ny)
-                    while parent[cur] is not None:
-                        cur = parent[cur]
-                        path.append(cur)
-                    path.reverse()
-                    if len(path) >= 2:
-                        return path[1]  # first step from start
-                    else:
-                        return None
-                seen.add((nx, ny))
-                dq.append((nx, ny))
-        return None
+        node = self.nav.nearest_node(start_tile)
+        if node is None:
+            return None
+        return self.nav.next_step(start_tile, node)
 
     def _plan_move_from_non_node(self):
         tx, ty = self.current_tile()
@@ -367,84 +523,31 @@ class Ghost:
                 self.choose_next_direction_to(next_step)
 
     def _next_tile_towards(self, start_tile, target_tile):
-        """BFS over walkable tiles; return immediate next step toward target."""
-        sx, sy = start_tile
-        tx, ty = target_tile
-        if (sx, sy) == (tx, ty):
+        """Return immediate next step along a shortest walkable route toward target."""
+        if start_tile == target_tile:
             return None
-        from collections import deque
-        dq = deque()
-        dq.append((sx, sy))
-        parent = { (sx, sy): None }
-        seen = { (sx, sy) }
-        while dq:
-            x, y = dq.popleft()
-            for nx, ny in neighbors_with_tunnel(x, y):
-                if (nx, ny) in seen:
-                    continue
-                parent[(nx, ny)] = (x, y)
-                if (nx, ny) == (tx, ty):
-                    # reconstruct path and return first step
-                    path = [(nx, ny)]
-                    cur = (nx, ny)
-                    while parent[cur] is not None:
-                        cur = parent[cur]
-                        path.append(cur)
-                    path.reverse()
-                    if len(path) >= 2:
-                        return path[1]
-                    return None
-                seen.add((nx, ny))
-                dq.append((nx, ny))
-        return None
-
-    def _build_return_graph(self):
-        # Copy base nodes/adj and insert spawn tile as an explicit node with edges
-        nodes = set(self.nodes)
-        adj = {u: list(vs) for u, vs in self.adj.items()}
-        nodes.add(self.spawn_tile)
-
-        def raycast_from(x, y, dx, dy):
-            cx, cy = x, y
-            dist = 0
-            while True:
-                nx, ny = cx + dx, cy + dy
-                if ny == 9 and (nx < 0 or nx >= MAP_WIDTH):
-                    if nx < 0:
-                        nx = MAP_WIDTH - 1
-                    elif nx >= MAP_WIDTH:
-                        nx = 0
-                if not is_walkable(nx, ny):
-                    return None
-                dist += 1
-                cx, cy = nx, ny
-                if (cx, cy) in nodes:
-                    return (cx, cy, dist)
-
-        adj.setdefault(self.spawn_tile, [])
-        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-            hit = raycast_from(self.spawn_tile[0], self.spawn_tile[1], dx, dy)
-            if hit is not None:
-                nx, ny, w = hit
-                if (nx, ny) in nodes:
-                    adj[self.spawn_tile].append(((nx, ny), w))
-                    adj.setdefault((nx, ny), []).append((self.spawn_tile, w))
+        return self.nav.next_step(start_tile, target_tile)
 
-        return nodes, adj
+    def _nearest_node(self, tile):
+        """Nearest graph node to a tile; BFS fallback only for non-walkable tiles."""
+        node = self.nav.nearest_node(tile)
+        if node is None:
+            node = nearest_node_from_tile(tile, self.nodes)
+        return node
 
     def handle_tunnel(self):
         tx, ty = self.current_tile()
-        if ty != 9:
+        if ty not in MOVE_TABLE.tunnel_rows:
             return
-        now = pygame.time.get_ticks()
+        now = self._clock()
         if now < self._wrap_cooldown_until:
             return
         pixel_in_tile = self.px % TILE_SIZE
         if tx == 0 and self.dx < 0:
             if pixel_in_tile < TILE_SIZE // 2:
-                self.px = (MAP_WIDTH - 1) * TILE_SIZE + TILE_SIZE // 2
+                self.px = (maze.MAP_WIDTH - 1) * TILE_SIZE + TILE_SIZE // 2
                 self._wrap_cooldown_until = now + 60
-        elif tx == MAP_WIDTH - 1 and self.dx > 0:
+        elif tx == maze.MAP_WIDTH - 1 and self.dx > 0:
             if pixel_in_tile > TILE_SIZE // 2:
                 self.px = TILE_SIZE // 2
                 self._wrap_cooldown_until = now + 60
@@ -455,9 +558,9 @@ class Ghost:
         # Edge should be straight (same row or same column), except tunnel wrap
         if y == ny:
             # Horizontal move; decide direction considering wrap
-            if x == 0 and nx == MAP_WIDTH - 1:
+            if x == 0 and nx == maze.MAP_WIDTH - 1:
                 self.dx, self.dy = -1, 0
-            elif x == MAP_WIDTH - 1 and nx == 0:
+            elif x == maze.MAP_WIDTH - 1 and nx == 0:
                 self.dx, self.dy = 1, 0
             else:
                 self.dx = 1 if nx > x else -1
@@ -480,14 +583,13 @@ class Ghost:
         else:
             target_node = self._select_chase_target_node()
         start_node = (tx, ty)
-        if self.returning_to_base:
-            path = dijkstra(self.adj_return, start_node, target_node)
-        else:
-            path = dijkstra(self.adj, start_node, target_node)
-        self.path_nodes = path
-        # Set the immediate next node as the target (skip start)
-        if len(path) >= 2:
-            self.current_target_node = path[1]
+        # Next node along the shortest route, from the precomputed tables
+        nodes = self.nodes_return if self.returning_to_base else self.nodes
+        next_node = self.nav.next_node(start_node, target_node, nodes)
+        # Only the first leg of the route is materialized
+        self.path_nodes = [start_node] if next_node is None else [start_node, next_node]
+        if next_node is not None:
+            self.current_target_node = next_node
             self.choose_next_direction_to(self.current_target_node)
         else:
             # Fallback when already at target node: take a step toward raw target tile
@@ -498,7 +600,7 @@ class Ghost:
                 self.choose_next_direction_to(step)
             else:
                 # Secondary fallback: move toward nearest node of raw target
-                target_node2 = nearest_node_from_tile(raw_target_tile, self.nodes)
+                target_node2 = self._nearest_node(raw_target_tile)
                 step2 = self._next_tile_towards((tx, ty), target_node2)
                 if step2 is not None:
                     self.choose_next_direction_to(step2)
@@ -511,7 +613,7 @@ class Ghost:
         if self.pacman is not None:
             p_tile = (int(self.pacman.px // TILE_SIZE), int(self.pacman.py // TILE_SIZE))
         else:
-            p_tile = (MAP_WIDTH // 2, MAP_HEIGHT // 2)
+            p_tile = (maze.MAP_WIDTH // 2, maze.MAP_HEIGHT // 2)
         if self.behavior == "pinky":
             # Ambusher: aim 4 tiles ahead of Pacman's facing direction
             dx = getattr(self.pacman, 'dx', 0)
@@ -519,23 +621,23 @@ class Ghost:
             tx = p_tile[0] + 4 * dx
             ty = p_tile[1] + 4 * dy
             # Clamp within bounds; nearest_node will handle walls
-            tx = max(0, min(MAP_WIDTH - 1, tx))
-            ty = max(0, min(MAP_HEIGHT - 1, ty))
-            return nearest_node_from_tile((tx, ty), self.nodes)
+            tx = max(0, min(maze.MAP_WIDTH - 1, tx))
+            ty = max(0, min(maze.MAP_HEIGHT - 1, ty))
+            return self._nearest_node((tx, ty))
         if self.behavior == "inky" and self.partner is not None:
             # Flanker: compute a point 2 tiles ahead of Pacman, then vector from Blinky to that point and double it
             dx = getattr(self.pacman, 'dx', 0)
             dy = getattr(self.pacman, 'dy', 0)
             ahead_x = p_tile[0] + 2 * dx
             ahead_y = p_tile[1] + 2 * dy
-            ahead_x = max(0, min(MAP_WIDTH - 1, ahead_x))
-            ahead_y = max(0, min(MAP_HEIGHT - 1, ahead_y))
+            ahead_x = max(0, min(maze.MAP_WIDTH - 1, ahead_x))
+            ahead_y = max(0, min(maze.MAP_HEIGHT - 1, ahead_y))
             b_tx, b_ty = self.partner.current_tile()
             target_x = 2 * ahead_x - b_tx
             target_y = 2 * ahead_y - b_ty
-            target_x = max(0, min(MAP_WIDTH - 1, target_x))
-            target_y = max(0, min(MAP_HEIGHT - 1, target_y))
-            return nearest_node_from_tile((target_x, target_y), self.nodes)
+            target_x = max(0, min(maze.MAP_WIDTH - 1, target_x))
+            target_y = max(0, min(maze.MAP_HEIGHT - 1, target_y))
+            return self._nearest_node((target_x, target_y))
         if self.behavior == "clyde":
             # Coward: if distance to Pacman <= threshold, retreat to home corner; else chase like blinky
             tx, ty = self.current_tile()
@@ -549,9 +651,9 @@ class Ghost:
                 target_node = self._get_clyde_home_corner_node()
                 return target_node
             # Otherwise chase
-            return nearest_node_from_tile(p_tile, self.nodes)
+            return self._nearest_node(p_tile)
         # For 'blinky' and default, aim at Pacman's current tile (nearest node)
-        return nearest_node_from_tile(p_tile, self.nodes)
+        return self._nearest_node(p_tile)
 
     def set_partner(self, ghost):
         self.partner = ghost
@@ -561,23 +663,23 @@ class Ghost:
         if self.home_corner_node is not None:
             return self.home_corner_node
         # Pick a corner tile near bottom-left inside the maze bounds
-        corner_tile = (1, max(0, MAP_HEIGHT - 2))
-        self.home_corner_node = nearest_node_from_tile(corner_tile, self.nodes)
+        corner_tile = (1, max(0, maze.MAP_HEIGHT - 2))
+        self.home_corner_node = self._nearest_node(corner_tile)
         return self.home_corner_node
 
     # ------- Target tile helpers to avoid freeze and ensure grid alignment -------
     def _get_pac_tile_or_center(self):
         if self.pacman is not None:
             return (int(self.pacman.px // TILE_SIZE), int(self.pacman.py // TILE_SIZE))
-        return (MAP_WIDTH // 2, MAP_HEIGHT // 2)
+        return (maze.MAP_WIDTH // 2, maze.MAP_HEIGHT // 2)
 
     def _compute_pinky_target_tile(self, p_tile):
         dx = getattr(self.pacman, 'dx', 0)
         dy = getattr(self.pacman, 'dy', 0)
         tx = p_tile[0] + 4 * dx
         ty = p_tile[1] + 4 * dy
-        tx = max(0, min(MAP_WIDTH - 1, tx))
-        ty = max(0, min(MAP_HEIGHT - 1, ty))
+        tx = max(0, min(maze.MAP_WIDTH - 1, tx))
+        ty = max(0, min(maze.MAP_HEIGHT - 1, ty))
         return (tx, ty)
 
     def _compute_inky_target_tile(self, p_tile):
@@ -585,13 +687,13 @@ class Ghost:
         dy = getattr(self.pacman, 'dy', 0)
         ahead_x = p_tile[0] + 2 * dx
         ahead_y = p_tile[1] + 2 * dy
-        ahead_x = max(0, min(MAP_WIDTH - 1, ahead_x))
-        ahead_y = max(0, min(MAP_HEIGHT - 1, ahead_y))
+        ahead_x = max(0, min(maze.MAP_WIDTH - 1, ahead_x))
+        ahead_y = max(0, min(maze.MAP_HEIGHT - 1, ahead_y))
         b_tx, b_ty = self.partner.current_tile() if self.partner is not None else (ahead_x, ahead_y)
         target_x = 2 * ahead_x - b_tx
         target_y = 2 * ahead_y - b_ty
-        target_x = max(0, min(MAP_WIDTH - 1, target_x))
-        target_y = max(0, min(MAP_HEIGHT - 1, target_y))
+        target_x = max(0, min(maze.MAP_WIDTH - 1, target_x))
+        target_y = max(0, min(maze.MAP_HEIGHT - 1, target_y))
         return (target_x, target_y)
 
     def _select_target_tile(self):
@@ -610,7 +712,7 @@ class Ghost:
             dy = ty - py
             dist = math.sqrt(dx * dx + dy * dy)
             if dist <= 6:
-                return (1, max(0, MAP_HEIGHT - 2))
+                return (1, max(0, maze.MAP_HEIGHT - 2))
             return p_tile
         # blinky/default
         return p_tile
@@ -620,7 +722,7 @@ class Ghost:
         tx, ty = self.current_tile()
         best = None
         best_score = float('inf')
-        for nx, ny in neighbors_with_tunnel(tx, ty):
+        for nx, ny in MOVE_TABLE.neighbors(tx, ty):
             # Manhattan distance to target
             if target_tile is not None:
                 score = abs(nx - target_tile[0]) + abs(ny - target_tile[1])
@@ -635,9 +737,15 @@ class Ghost:
             self.dx, self.dy = 0, 0
 
     def update(self):
+        t0 = PROFILER.mark()
+        if self._cruise():
+            PROFILER.add(self._profile_move_stage, t0)
+            return
+        st, i = self._state, self._row
+        st.prev_px[i], st.prev_py[i] = st.px[i], st.py[i]
         # Mouth/animation not needed for ghost; update path decisions at nodes
         # Aggressive re-path for Blinky when Pacman moves tiles
-        if not self.returning_to_base and not self.scatter_active and self.pacman is not None:
+        if not st.returning_to_base[i] and not st.scatter_active[i] and self.pacman is not None:
             cur_p_tile = (int(self.pacman.px // TILE_SIZE), int(self.pacman.py // TILE_SIZE))
             if cur_p_tile != self._last_pac_tile:
                 self._last_pac_tile = cur_p_tile
@@ -646,7 +754,7 @@ class Ghost:
                 if (tx_tmp, ty_tmp) in self.nodes:
                     self.recompute_path_if_needed()
         # If not moving and not centered, try to step toward nearest node
-        if self.dx == 0 and self.dy == 0 and not self.at_tile_center():
+        if st.dx[i] == 0 and st.dy[i] == 0 and not self.at_tile_center():
             tx0, ty0 = self.current_tile()
             ns0 = self._next_tile_to_nearest_node((tx0, ty0))
             if ns0 is not None:
@@ -669,14 +777,16 @@ class Ghost:
                     self.recompute_path_if_needed()
                 else:
                     # Ensure we have a direction to reach a node if stuck
-                    if self.dx == 0 and self.dy == 0:
+                    if st.dx[i] == 0 and st.dy[i] == 0:
                         next_step = self._next_tile_to_nearest_node((tx, ty))
                         if next_step is not None:
                             self.choose_next_direction_to(next_step)
 
+        # Path decisions done; the rest is movement (plus replanning when blocked)
+        t0 = PROFILER.add(self._profile_path_stage, t0)
         # Move along current direction if walkable; else stop
-        next_px = self.px + self.dx * self.speed
-        next_py = self.py + self.dy * self.speed
+        next_px = st.px[i] + st.dx[i] * st.speed[i]
+        next_py = st.py[i] + st.dy[i] * st.speed[i]
         # Predict next tile
         next_tx = int(next_px // TILE_SIZE)
         next_ty = int(next_py // TILE_SIZE)
@@ -684,11 +794,10 @@ class Ghost:
         cur_tx, cur_ty = self.current_tile()
         crossing_tile_boundary = (next_tx != cur_tx) or (next_ty != cur_ty)
         if not crossing_tile_boundary or is_walkable(next_tx, next_ty):
-            self.px = next_px
-            self.py = next_py
+            st.px[i], st.py[i] = next_px, next_py
             # mark movement time
             try:
-                self._last_move_ms = pygame.time.get_ticks()
+                self._last_move_ms = self._clock()
             except Exception:
                 pass
             # Keep movement visually aligned to corridor centers
@@ -700,7 +809,7 @@ class Ghost:
             self.py = cur_ty * TILE_SIZE + TILE_SIZE // 2
             self.dx = 0
             self.dy = 0
-            if self.returning_to_base:
+            if st.returning_to_base[i]:
                 ns = self._next_tile_towards((cur_tx, cur_ty), self.spawn_tile)
                 if ns is not None:
                     self.choose_next_direction_to(ns)
@@ -720,7 +829,7 @@ class Ghost:
 
         # Idle freeze guard: if no movement for 300ms, pick any walkable direction toward target
         try:
-            now2 = pygame.time.get_ticks()
+            now2 = self._clock()
             if now2 - self._last_move_ms > 300:
                 self._choose_any_walkable_direction(self._select_target_tile())
                 self._last_move_ms = now2
@@ -736,7 +845,7 @@ class Ghost:
             self.dx = 0
             self.dy = 0
             # Plan next step depending on mode
-            if self.returning_to_base:
+            if st.returning_to_base[i]:
                 # Use return graph from nearest node toward spawn
                 tx, ty = self.current_tile()
                 if (tx, ty) in self.nodes_return:
@@ -756,34 +865,209 @@ class Ghost:
                         self.choose_next_direction_to(ns)
 
         # Auto-exit scatter when time expires (unless returning to base)
-        if self.scatter_active and not self.returning_to_base:
-            if self._scatter_until_ms is not None and pygame.time.get_ticks() >= self._scatter_until_ms:
+        if st.scatter_active[i] and not st.returning_to_base[i]:
+            if self._scatter_until_ms is not None and self._clock() >= self._scatter_until_ms:
                 self.scatter_active = False
                 self._scatter_until_ms = None
 
         # Finish return-to-base when reaching spawn center
-        if self.returning_to_base:
+        if st.returning_to_base[i]:
             if self.at_tile_center() and self.current_tile() == self.spawn_tile:
                 self.reset_to_spawn()
                 self.returning_to_base = False
+        self._refile()
+        PROFILER.add(self._profile_move_stage, t0)
 
-    def draw(self):
-        cx, cy = int(self.px), int(self.py)
+    def draw(self, alpha=1.0):
+        """Draw the ghost (interpolated by alpha) and return the list of screen rects touched."""
+        render_x, render_y = self.render_pos(alpha)
+        cx, cy = int(render_x), int(render_y)
         if self.scatter_active and self.scatter_image is not None:
             rect = self.scatter_image.get_rect(center=(cx, cy))
-            screen.blit(self.scatter_image, rect)
+            return [maze.screen.blit(self.scatter_image, rect)]
         elif self.image is not None:
             rect = self.image.get_rect(center=(cx, cy))
-            screen.blit(self.image, rect)
+            return [maze.screen.blit(self.image, rect)]
         else:
             body_color = self.color
-            pygame.draw.circle(screen, body_color, (cx, cy), self.radius)
+            body_rect = pygame.draw.circle(maze.screen, body_color, (cx, cy), self.radius)
             # Eyes
             eye_offset_x = self.radius // 2
             eye_offset_y = -self.radius // 3
             eye_radius = max(2, self.radius // 4)
-            pygame.draw.circle(screen, (255, 255, 255), (cx - eye_offset_x, cy + eye_offset_y), eye_radius)
-            pygame.draw.circle(screen, (255, 255, 255), (cx + eye_offset_x, cy + eye_offset_y), eye_radius)
+            pygame.draw.circle(maze.screen, (255, 255, 255), (cx - eye_offset_x, cy + eye_offset_y), eye_radius)
+            pygame.draw.circle(maze.screen, (255, 255, 255), (cx + eye_offset_x, cy + eye_offset_y), eye_radius)
             pupil_radius = max(1, eye_radius // 2)
-            pygame.draw.circle(screen, (0, 0, 255), (cx - eye_offset_x + 1, cy + eye_offset_y), pupil_radius)
-            pygame.draw.circle(screen, (0, 0, 255), (cx + eye_offset_x + 1, cy + eye_offset_y), pupil_radius)
+            pygame.draw.circle(maze.screen, (0, 0, 255), (cx - eye_offset_x + 1, cy + eye_offset_y), pupil_radius)
+            pygame.draw.circle(maze.screen, (0, 0, 255), (cx + eye_offset_x + 1, cy + eye_offset_y), pupil_radius)
+            return [body_rect]
+
+
+# Wall, node and tunnel-row masks for the vectorized step, keyed by maze key
+_batch_grid_cache = {}
+
+
+def _get_batch_grids():
+    """Return (walkable, node, tunnel_row) boolean arrays for the current maze."""
+    key = maze.CURRENT_MAZE_KEY
+    grids = _batch_grid_cache.get(key)
+    if grids is None:
+        width, height = maze.MAP_WIDTH, maze.MAP_HEIGHT
+        tiles = np.frombuffer(bytes(MAP_DATA.buffer), dtype=np.uint8).reshape(height, width)
+        walkable = tiles != WALL
+        node = np.zeros((height, width), dtype=bool)
+        nodes, _ = get_maze_graph()
+        for x, y in nodes:
+            node[y, x] = True
+        tunnel_row = np.zeros(height, dtype=bool)
+        tunnel_row[list(MOVE_TABLE.tunnel_rows)] = True
+        grids = (walkable, node, tunnel_row)
+        _batch_grid_cache[key] = grids
+    return grids
+
+
+def _align_rows(px, py, dx, dy, speed):
+    """Vectorized Ghost._align_to_axis_center for the given rows; returns the new (px, py)."""
+    center = TILE_SIZE // 2
+    corr = np.maximum(0.4, np.minimum(1.0, speed * 0.5))
+    desired_y = (py // TILE_SIZE) * TILE_SIZE + center
+    diff_y = desired_y - py
+    aligned_y = np.where(np.abs(diff_y) <= 1, desired_y, py + np.copysign(np.minimum(np.abs(diff_y), corr), diff_y))
+    desired_x = (px // TILE_SIZE) * TILE_SIZE + center
+    diff_x = desired_x - px
+    aligned_x = np.where(np.abs(diff_x) <= 1, desired_x, px + np.copysign(np.minimum(np.abs(diff_x), corr), diff_x))
+    horizontal = (dx != 0) & (dy == 0)
+    vertical = (dy != 0) & (dx == 0)
+    return np.where(vertical, aligned_x, px), np.where(horizontal, aligned_y, py)
+
+
+def _cruise_step(state, pacman, now):
+    """Move every cruising ghost of state in one vectorized step.
+
+    A ghost cruises when Ghost.update() would do nothing but move it: it is
+    moving, off its tile center, not due to re-path for Pacman's new tile, not
+    leaving into a wall, away from tunnel rows, not returning to base and not at
+    the end of scatter. Those rows are advanced and aligned exactly as update()
+    would; returns the list of rows (0/1) that were handled.
+    """
+    walkable, node, tunnel_row = _get_batch_grids()
+    height, width = walkable.shape
+    c = state.numpy_columns(np)
+    px, py, dx, dy, speed = c["px"], c["py"], c["dx"], c["dy"], c["speed"]
+    scatter = c["scatter_active"] != 0
+    returning = c["returning_to_base"] != 0
+
+    tx = (px // TILE_SIZE).astype(np.intp)
+    ty = (py // TILE_SIZE).astype(np.intp)
+    next_px = px + dx * speed
+    next_py = py + dy * speed
+    next_tx = (next_px // TILE_SIZE).astype(np.intp)
+    next_ty = (next_py // TILE_SIZE).astype(np.intp)
+    inside = ((tx >= 0) & (tx < width) & (ty >= 0) & (ty < height)
+              & (next_tx >= 0) & (next_tx < width) & (next_ty >= 0) & (next_ty < height))
+    # Clamp so the mask lookups stay in range; rows outside are excluded anyway
+    tx, ty = np.clip(tx, 0, width - 1), np.clip(ty, 0, height - 1)
+    next_tx, next_ty = np.clip(next_tx, 0, width - 1), np.clip(next_ty, 0, height - 1)
+
+    center = TILE_SIZE // 2
+    at_center = (np.abs(px % TILE_SIZE - center) <= 1) & (np.abs(py % TILE_SIZE - center) <= 1)
+    pac_x, pac_y = int(pacman.px // TILE_SIZE), int(pacman.py // TILE_SIZE)
+    pac_moved = ~returning & ~scatter & ((c["last_pac_x"] != pac_x) | (c["last_pac_y"] != pac_y))
+    scatter_over = scatter & (now >= c["scatter_until_ms"])
+
+    cruise = (inside & ((dx != 0) | (dy != 0)) & ~at_center
+              & ~(pac_moved & node[ty, tx])
+              & walkable[next_ty, next_tx]
+              & ~tunnel_row[ty] & ~tunnel_row[next_ty]
+              & ~returning & ~scatter_over)
+    rows = np.flatnonzero(cruise)
+    if rows.size:
+        c["prev_px"][rows] = px[rows]
+        c["prev_py"][rows] = py[rows]
+        row_dx, row_dy, row_speed = dx[rows], dy[rows], speed[rows]
+        new_px, new_py = next_px[rows], next_py[rows]
+        # Aligned after the move and again after the (no-op) tunnel check, as in update()
+        for _ in range(2):
+            new_px, new_py = _align_rows(new_px, new_py, row_dx, row_dy, row_speed)
+        px[rows] = new_px
+        py[rows] = new_py
+        c["last_move_ms"][rows] = now
+        seen = rows[pac_moved[rows]]
+        c["last_pac_x"][seen] = pac_x
+        c["last_pac_y"][seen] = pac_y
+    return cruise.tolist()
+
+
+def update_ghosts(ghosts):
+    """Advance every ghost by one simulation step.
+
+    Large swarms sharing one GhostState (see main.create_ghosts) move their
+    cruising ghosts in a single vectorized step; the others run Ghost.update()
+    in list order. Cruising ghosts read no other ghost's state, so the result is
+    the same as updating each ghost in turn.
+    """
+    state = ghosts[0]._state if ghosts else None
+    if (np is None or len(ghosts) < BATCH_MIN_GHOSTS or ghosts[0].pacman is None
+            or state.owners != ghosts):
+        for g in ghosts:
+            g.update()
+        return
+    t0 = PROFILER.mark()
+    moved = _cruise_step(state, ghosts[0].pacman, ghosts[0]._clock())
+    PROFILER.add("ghosts.batch", t0)
+    for g, done in zip(ghosts, moved):
+        if not done:
+            g.update()
+    # Ghosts that ran update() refiled themselves; the batch-moved rows still need it
+    t0 = PROFILER.mark()
+    _refile_moved_rows(state)
+    PROFILER.add("ghosts.index", t0)
+
+
+def _refile_moved_rows(state):
+    """Move rows whose tile changed to their new bucket (vectorized tile compare)."""
+    c = state.numpy_columns(np)
+    tx = (c["px"] // TILE_SIZE).astype(np.intc)
+    ty = (c["py"] // TILE_SIZE).astype(np.intc)
+    rows = np.flatnonzero((tx != c["tile_x"]) | (ty != c["tile_y"]))
+    if rows.size:
+        c["tile_x"][rows] = tx[rows]
+        c["tile_y"][rows] = ty[rows]
+        place = state.buckets.place
+        for row, x, y in zip(rows.tolist(), tx[rows].tolist(), ty[rows].tolist()):
+            place(row, (x, y))
+
+
+def _shared_state(ghosts):
+    """The GhostState holding exactly these ghosts (as made by main.create_ghosts), or None."""
+    if not ghosts:
+        return None
+    state = ghosts[0]._state
+    return state if len(state) == len(ghosts) else None
+
+
+def ghosts_near(ghosts, tile, n):
+    """Ghosts standing at most n tiles from tile on both axes, in list order.
+
+    Ghosts sharing one GhostState are looked up in its tile index, so the cost
+    depends on n and on the ghosts found, not on the number of ghosts.
+    """
+    state = _shared_state(ghosts)
+    if state is None:
+        tx, ty = tile
+        near = []
+        for g in ghosts:
+            gx, gy = g.current_tile()
+            if abs(gx - tx) <= n and abs(gy - ty) <= n:
+                near.append(g)
+        return near
+    owners = state.owners
+    return [owners[row] for row in state.buckets.within(tile, n)]
+
+
+def ghost_within(ghosts, tile, n):
+    """True if any ghost stands at most n tiles from tile on both axes."""
+    state = _shared_state(ghosts)
+    if state is None:
+        return bool(ghosts_near(ghosts, tile, n))
+    return state.buckets.any_within(tile, n)
@@ -0,0 +1,71 @@
+"""Struct-of-arrays storage for ghost state.
+
+Each ghost owns one row of a GhostState: its position, direction, speeds, mode
+flags and movement timers live in typed, contiguous columns (stdlib ``array``)
+instead of per-instance attributes. ``Ghost`` reads and writes its row through
+properties, and a batch step can update every row at once through zero-copy
+NumPy views of the same columns (``numpy_columns``). Rows are also filed in a
+tile-bucketed index (``buckets``) by the tile in the ``tile_x``/``tile_y``
+columns.
+"""
+from array import array
+
+from spatial import TileBuckets
+
+# Sentinels for values the Ghost API exposes as None
+NO_DEADLINE = float("inf")
+NO_TILE = -(2 ** 31)
+
+# (column, typecode, value for a new row)
+COLUMNS = (
+    ("px", "d", 0.0),
+    ("py", "d", 0.0),
+    ("prev_px", "d", 0.0),
+    ("prev_py", "d", 0.0),
+    ("dx", "b", 0),
+    ("dy", "b", 0),
+    ("speed", "d", 0.0),
+    ("normal_speed", "d", 0.0),
+    ("scatter_active", "B", 0),
+    ("returning_to_base", "B", 0),
+    ("scatter_until_ms", "d", NO_DEADLINE),
+    ("last_move_ms", "d", 0.0),
+    ("last_pac_x", "i", NO_TILE),
+    ("last_pac_y", "i", NO_TILE),
+    # Tile the row is filed under in GhostState.buckets
+    ("tile_x", "i", NO_TILE),
+    ("tile_y", "i", NO_TILE),
+)
+
+
+class GhostState:
+    def __init__(self):
+        for name, typecode, _ in COLUMNS:
+            setattr(self, name, array(typecode))
+        # Ghost object per row, in row order
+        self.owners = []
+        # Rows by tile, for collision and proximity queries
+        self.buckets = TileBuckets()
+
+    def __len__(self):
+        return len(self.owners)
+
+    def add_row(self, owner):
+        """Append a row with default values for owner; returns its index."""
+        for name, _, default in COLUMNS:
+            getattr(self, name).append(default)
+        self.owners.append(owner)
+        return len(self.owners) - 1
+
+    def file_row(self, row, tile):
+        """Record that row now stands on tile (x, y) and move it to that bucket."""
+        self.tile_x[row], self.tile_y[row] = tile
+        self.buckets.place(row, tile)
+
+    def numpy_columns(self, np):
+        """Writable NumPy views of every column, keyed by name.
+
+        The views share memory with the arrays, so rows cannot be added while
+        they are alive; drop them before the next add_row().
+        """
+        return {name: np.frombuffer(getattr(self, name), dtype=typecode) for name, typecode, _ in COLUMNS}
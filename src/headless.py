@@ -0,0 +1,169 @@
+# headless.py
+"""Headless game engine: runs Pacman, Ghosts and LevelSystem without a window.
+
+Time comes from a simulated millisecond clock that advances a fixed amount per
+step, so games can be stepped as fast as the CPU allows (AI evaluation,
+regression runs, balancing on display-less build servers).
+
+Usage:
+    python src/headless.py --frames 36000 --seed 1
+"""
+import argparse
+import random
+import time
+
+import pygame
+
+import maze
+from maze import load_maze_by_key, PELLET_TILES, POWER_PELLET_TILES
+from ghost import get_maze_navigation
+from pacman import Pacman
+from lavel_system import LevelSystem
+from main import GHOST_SPEED, INITIAL_LIVES, create_ghosts, update_gameplay
+
+# Direction name -> key code consumed by Pacman.handle_input
+DIRECTION_KEYS = {
+    "up": pygame.K_UP,
+    "down": pygame.K_DOWN,
+    "left": pygame.K_LEFT,
+    "right": pygame.K_RIGHT,
+}
+
+
+class RandomController:
+    """Press a random direction every `change_every` frames."""
+
+    def __init__(self, seed=None, change_every=20):
+        self.rng = random.Random(seed)
+        self.change_every = change_every
+
+    def __call__(self, game):
+        if game.frame % self.change_every == 0:
+            return self.rng.choice(list(DIRECTION_KEYS))
+        return None
+
+
+class GreedyPelletController:
+    """Head for the closest remaining pellet by walking distance."""
+
+    # (dx, dy) of a single step -> direction name
+    STEP_DIRECTIONS = {(1, 0): "right", (-1, 0): "left", (0, 1): "down", (0, -1): "up"}
+
+    def __init__(self, seed=None):
+        # Unused; accepted so every controller can be built the same way
+        self.seed = seed
+        self._last_tile = None
+        self._direction = None
+
+    def __call__(self, game):
+        tile = game.pacman.current_tile()
+        if tile == self._last_tile:
+            return self._direction
+        self._last_tile = tile
+        nav = get_maze_navigation()
+        best = None
+        best_dist = None
+        for pellet in PELLET_TILES | POWER_PELLET_TILES:
+            d = nav.distance(tile, pellet)
+            # Pacman counts as on a tile before reaching its center, where that
+            # tile's pellet is eaten; heading for it (distance 0) gives no step
+            if d and (best_dist is None or d < best_dist):
+                best = pellet
+                best_dist = d
+        step = nav.next_step(tile, best) if best is not None else None
+        if step is None:
+            # Nothing to head for: keep the current heading rather than stopping
+            return self._direction
+        dx = step[0] - tile[0]
+        dy = step[1] - tile[1]
+        if abs(dx) > 1:
+            # Tunnel wrap: the step lands on the opposite edge
+            dx = -1 if dx > 0 else 1
+        self._direction = self.STEP_DIRECTIONS.get((dx, dy))
+        return self._direction
+
+
+CONTROLLERS = {
+    "random": RandomController,
+    "greedy": GreedyPelletController,
+}
+
+
+class HeadlessGame:
+    """One game session driven by a simulated clock instead of the wall clock."""
+
+    def __init__(self, ghost_speed=GHOST_SPEED, initial_lives=INITIAL_LIVES, fps=60, seed=None, maze_key=None,
+                 ghost_count=4):
+        self.frame = 0
+        self.seed = seed
+        self.initial_lives = initial_lives
+        # All game randomness (ghost spawns, scatter lengths, maze order) comes from here
+        self.rng = random.Random(seed)
+        self.frame_ms = 1000.0 / fps
+        self._ticks_ms = 0.0
+        # First game in the process: load the mazes without opening a window
+        if not maze.is_initialized():
+            maze.init(maze_key, headless=True)
+        # Every game starts from a fresh copy of the initial (or given same-size) maze
+        if not load_maze_by_key(maze_key or maze.INITIAL_MAZE_KEY):
+            raise ValueError(f"Cannot start on maze {maze_key}: its size differs from maze {maze.INITIAL_MAZE_KEY}")
+        self.pacman = Pacman()
+        self.ghosts = create_ghosts(self.pacman, speed=ghost_speed, clock=self.get_ticks, rng=self.rng,
+                                    count=ghost_count)
+        self.level = LevelSystem(initial_lives=initial_lives, rng=self.rng)
+
+    def get_ticks(self) -> int:
+        """Simulated milliseconds since the game started (pygame.time.get_ticks stand-in)."""
+        return int(self._ticks_ms)
+
+    def is_over(self) -> bool:
+        return self.level.is_game_over()
+
+    def step(self, direction=None):
+        """Advance one frame. direction is one of DIRECTION_KEYS or None for no input."""
+        if direction is not None:
+            event = pygame.event.Event(pygame.KEYDOWN, key=DIRECTION_KEYS[direction])
+            self.pacman.handle_input(event)
+        if not self.level.is_game_over():
+            update_gameplay(self.pacman, self.ghosts, self.level)
+        self.frame += 1
+        self._ticks_ms += self.frame_ms
+
+    def run(self, controller, max_frames):
+        """Step until game over or max_frames; controller(game) returns a direction or None."""
+        while self.frame < max_frames and not self.is_over():
+            self.step(controller(self))
+        return self.result()
+
+    def result(self) -> dict:
+        return {
+            "score": self.pacman.pallet_count,
+            "level": self.level.level,
+            "lives": self.level.get_lives(),
+            "deaths": self.initial_lives - self.level.get_lives(),
+            "game_over": self.level.is_game_over(),
+            "frames": self.frame,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run one headless Pacman game.")
+    parser.add_argument("--frames", type=int, default=36000, help="frame limit (60 frames = 1 game second)")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the game and the controller")
+    parser.add_argument("--controller", choices=sorted(CONTROLLERS), default="random")
+    parser.add_argument("--ghosts", type=int, default=4, help="number of ghosts (more than 4 = swarm mode)")
+    parser.add_argument("--ghost-speed", type=float, default=GHOST_SPEED)
+    parser.add_argument("--lives", type=int, default=INITIAL_LIVES)
+    args = parser.parse_args()
+
+    game = HeadlessGame(ghost_speed=args.ghost_speed, initial_lives=args.lives, seed=args.seed,
+                        ghost_count=args.ghosts)
+    start = time.perf_counter()
+    result = game.run(CONTROLLERS[args.controller](seed=args.seed), args.frames)
+    elapsed = time.perf_counter() - start
+    print(result)
+    print(f"{result['frames']} frames in {elapsed:.2f}s ({result['frames'] / max(elapsed, 1e-9):.0f} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
 import pygame
 import os
 import random
-from maze import TILE_SIZE, screen, MAP_DATA, reset_maze, load_maze_by_key, get_same_size_maze_keys
-from paths import resource_path
+import maze
+from maze import TILE_SIZE, MAP_DATA, reset_maze, load_maze_by_key, get_same_size_maze_keys, remaining_pellets
+from text import get_font, render_text
+from assets import get_sprite
+from ghost import ghosts_near
 
 class LevelSystem:
-	def __init__(self, initial_lives: int = 3):
+	def __init__(self, initial_lives: int = 3, rng=None):
 		self.lives = initial_lives
+		# Random source for maze selection (seeded Random for reproducible runs)
+		self._rng = rng if rng is not None else random
 		self.game_over = False
 		self.level = 1
 		# Track mazes used this session; start with '1' for first level
@@ -16,52 +21,41 @@ class LevelSystem:
 			self._same_size_keys = ["1"]
 		self._used_maze_keys = ["1"]
 		self.life_icon = None
-		self._level_font = None
-		try:
-			sprite_path = resource_path("assets", "sprites", "pacman.png")
-			img = pygame.image.load(sprite_path).convert_alpha()
-			size = max(16, TILE_SIZE - 6)
-			self.life_icon = pygame.transform.smoothscale(img, (size, size))
-		except Exception as e:
-			print("Failed to load life icon:", e)
+		# No icon to load when running headless (no display)
+		if maze.screen is not None:
+			try:
+				size = max(16, TILE_SIZE - 6)
+				self.life_icon = get_sprite("pacman.png", size)
+			except Exception as e:
+				print("Failed to load life icon:", e)
 
 	def draw_lives(self):
+		"""Draw remaining lives at the top-right and return the screen rects touched."""
 		if self.life_icon is None or self.lives <= 0:
-			return
+			return []
 		spacing = self.life_icon.get_width() + 6
-		screen_w = screen.get_width()
+		screen_w = maze.screen.get_width()
+		dirty = []
 		for i in range(self.lives):
 			rect = self.life_icon.get_rect()
 			rect.topright = (screen_w - i * spacing, 0)
-			screen.blit(self.life_icon, rect)
+			dirty.append(maze.screen.blit(self.life_icon, rect))
+		return dirty
 
 	def draw_level_title(self):
-		"""Draw the current level at top-left around (120, 0)."""
-		# Initialize font lazily
-		if self._level_font is None:
-			try:
-				if not pygame.font.get_init():
-					pygame.font.init()
-				font_path = resource_path("src", "fonts", "CascadiaCode-VariableFont_wght.ttf")
-				self._level_font = pygame.font.Font(font_path, 22)
-			except Exception:
-				self._level_font = pygame.font.SysFont(None, 22)
+		"""Draw the current level at top-left around (120, 0) and return the screen rects touched."""
+		# Cached text: only re-rendered when the level changes
 		label = f"Level: {self.level}"
 		color = (255, 255, 255)
-		surf = self._level_font.render(label, True, color)
-		screen.blit(surf, (120, 0))
+		surf = render_text(get_font(22), label, color)
+		return [maze.screen.blit(surf, (120, 0))]
 
 	def check_level_completion(self, pacman, ghosts):
 		"""If all pellets are eaten, advance level, reset maze, and speed up ghosts."""
 		if self.game_over:
 			return
-		# Detect remaining pellets (2 or 3) in the current MAP_DATA
-		remaining = 0
-		for row in MAP_DATA:
-			for v in row:
-				if v == 2 or v == 3:
-					remaining += 1
-		if remaining == 0:
+		# Remaining pellets (2 or 3) come from the maze's incremental pellet index
+		if remaining_pellets() == 0:
 			# Advance level
 			self.level += 1
 			# Select next maze key: first level always '1'; later random among same-size keys
@@ -69,14 +63,14 @@ class LevelSystem:
 			if self.level == 2:
 				# After finishing level 1, pick any same-size maze excluding '1' if available
 				candidates = [k for k in self._same_size_keys if k != "1"] or self._same_size_keys
-				next_key = random.choice(candidates)
+				next_key = self._rng.choice(candidates)
 			else:
 				# Avoid immediate repeats; use pool of same-size keys not yet used
 				remaining_keys = [k for k in self._same_size_keys if k not in self._used_maze_keys]
 				if not remaining_keys:
 					# Reset pool except keep last used to avoid direct repeat
 					remaining_keys = [k for k in self._same_size_keys if k != self._used_maze_keys[-1]] or self._same_size_keys
-				next_key = random.choice(remaining_keys)
+				next_key = self._rng.choice(remaining_keys)
 			if next_key is None:
 				next_key = "1"
 			# Attempt to load the selected maze; fallback to simple reset on failure
@@ -107,6 +101,15 @@ class LevelSystem:
 					if hasattr(g, 'reset_to_spawn'):
 						g.reset_to_spawn()
 
+	def collision_candidates(self, pacman, ghosts):
+		"""Ghosts close enough to Pacman to possibly collide, in their original order.
+
+		Read from the ghosts' tile index, so swarms of ghosts far from Pacman cost
+		nothing before check_collision_and_reset (ghost radii are at most half a tile).
+		"""
+		reach = (getattr(pacman, 'radius', TILE_SIZE // 2) + TILE_SIZE // 2) * 0.8
+		return ghosts_near(ghosts, pacman.current_tile(), int(reach // TILE_SIZE) + 1)
+
 	def check_collision_and_reset(self, pacman, ghost):
 		dx = pacman.px - ghost.px
 		dy = pacman.py - ghost.py
@@ -146,26 +149,14 @@ class LevelSystem:
 		if not self.game_over:
 			return
 		# Semi-transparent dark overlay
-		overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+		overlay = pygame.Surface(maze.screen.get_size(), pygame.SRCALPHA)
 		overlay.fill((0, 0, 0, 160))
-		screen.blit(overlay, (0, 0))
-		# Title font
-		try:
-			if not pygame.font.get_init():
-				pygame.font.init()
-			font_path = resource_path("src", "fonts", "CascadiaCode-VariableFont_wght.ttf")
-			font = pygame.font.Font(font_path, 72)
-		except Exception:
-			font = pygame.font.SysFont(None, 72)
-		# Render text
-		title = font.render("GAME OVER", True, (255, 80, 80))
-		tr = title.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2 - 20))
-		screen.blit(title, tr)
+		maze.screen.blit(overlay, (0, 0))
+		# Render text (fonts and surfaces come from the shared caches)
+		title = render_text(get_font(72), "GAME OVER", (255, 80, 80))
+		tr = title.get_rect(center=(maze.screen.get_width() // 2, maze.screen.get_height() // 2 - 20))
+		maze.screen.blit(title, tr)
 		# Subtext
-		try:
-			sub_font = pygame.font.Font(resource_path("src", "fonts", "CascadiaCode-VariableFont_wght.ttf"), 28)
-		except Exception:
-			sub_font = pygame.font.SysFont(None, 28)
-		sub = sub_font.render("No lives left", True, (255, 255, 255))
-		sr = sub.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2 + 32))
-		screen.blit(sub, sr)
+		sub = render_text(get_font(28), "No lives left", (255, 255, 255))
+		sr = sub.get_rect(center=(maze.screen.get_width() // 2, maze.screen.get_height() // 2 + 32))
+		maze.screen.blit(sub, sr)
@@ -1,133 +1,336 @@
 # main.py
+import time
+# Process start reference for PACMAN_STARTUP_TIMING (taken before the game modules load)
+STARTUP_T0 = time.perf_counter()
+
 import pygame
+import random
 import sys
 import os
-from maze import draw_smooth_map, screen, SCREEN_WIDTH, SCREEN_HEIGHT, reset_maze
+import maze
+from maze import draw_smooth_map, reset_maze, load_maze_by_key, map_cache_stale, restore_map_regions
 from pacman import Pacman
-from ghost import Ghost
+from ghost import Ghost, update_ghosts
+from ghoststate import GhostState
 from lavel_system import LevelSystem
 from menu import Menu
+from profiler import PROFILER, FrameRateReadout
+from replay import InputRecorder, new_recording_path
 
 # Config variables
 GHOST_SPEED = 1.1
 INITIAL_LIVES = 8
+# Number of ghosts. More than four is swarm mode (e.g. PACMAN_GHOSTS=64): the four
+# personalities repeat, speeds are spread a little so the swarm fans out, and an
+# FPS/frame-time readout is shown. Recording is only supported with four ghosts.
+GHOST_COUNT = int(os.environ.get("PACMAN_GHOSTS", "4"))
+# Only push the screen regions touched this frame (and last frame) to the display
+# instead of flipping the whole window. Set False to compare against full flips.
+DIRTY_RECT_RENDERING = True
+# Game logic advances in fixed steps at SIM_HZ, independent of the render rate.
+# Speeds (GHOST_SPEED, Pacman.speed) are pixels per simulation step.
+SIM_HZ = 60
+# Most simulation steps run to catch up after a slow frame; older backlog is dropped
+MAX_SIM_STEPS_PER_FRAME = 5
+# Render frame cap (e.g. 120 or 144 on high refresh displays; 0 = uncapped)
+RENDER_FPS = 60
+# Frame-time instrumentation overlay (p50/p99/max per stage); opt in with PACMAN_PROFILE=1.
+# PACMAN_PROFILE_DUMP=<path> also appends one JSON line per frame to that file.
+PROFILE_FRAMES = os.environ.get("PACMAN_PROFILE") == "1"
+PROFILE_DUMP_PATH = os.environ.get("PACMAN_PROFILE_DUMP")
+# Record every game (seed + per-step inputs) to a log in this directory for replay.py
+RECORD_DIR = os.environ.get("PACMAN_RECORD")
+# PACMAN_STARTUP_TIMING=1: print per-phase startup times and time-to-first-frame, then exit
+STARTUP_TIMING = os.environ.get("PACMAN_STARTUP_TIMING") == "1"
 
 # Global menu instance
 menu = None
 
-def run_game():
-    """Main game loop"""
+# The four ghost personalities: (color, spawn marker, sprite variant, behavior)
+GHOST_TYPES = [
+    ((255, 0, 0), 5, "red", "blinky"),
+    ((0, 0, 255), 6, "blue", "inky"),
+    ((255, 165, 0), 7, "orenge", "clyde"),
+    ((255, 105, 180), 8, "pink", "pinky"),
+]
+# Slowest swarm ghost relative to the base speed
+SWARM_MIN_SPEED_FACTOR = 0.85
+
+def create_ghosts(pacman, speed=GHOST_SPEED, clock=None, rng=None, count=4):
+    """Create the four standard ghosts, plus count - 4 more for swarm mode.
+
+    clock overrides the ghosts' millisecond tick source and rng their random source.
+    Extra ghosts cycle through the four personalities with slightly lower speeds
+    (so ghosts from the same spawn spread out); inky ghosts flank the first blinky.
+    """
+    rng = rng if rng is not None else random
+    # All ghosts keep their positions, directions, speeds and flags in one column store
+    state = GhostState()
+    ghosts = []
+    for i in range(count):
+        color, spawn_value, variant, behavior = GHOST_TYPES[i % len(GHOST_TYPES)]
+        ghost_speed = speed
+        if i >= len(GHOST_TYPES):
+            ghost_speed = speed * rng.uniform(SWARM_MIN_SPEED_FACTOR, 1.0)
+        partner = ghosts[0] if behavior == "inky" else None
+        ghosts.append(Ghost(color=color, pacman=pacman, speed=ghost_speed, spawn_values={spawn_value},
+                            sprite_variant=variant, behavior=behavior, partner=partner, clock=clock, rng=rng,
+                            state=state))
+    return ghosts
+
+def update_gameplay(pacman, ghosts, level):
+    """Advance game logic by one frame (movement, scatter, collisions, level completion)."""
+    # Update Pacman first
+    t0 = PROFILER.mark()
+    pacman.update()
+    PROFILER.add("pacman", t0)
+    
+    # If Pacman ate a power pellet this frame, enter scatter BEFORE collisions
+    if getattr(pacman, 'last_ate_power', False):
+        for g in ghosts:
+            if hasattr(g, 'enter_scatter_mode'):
+                g.enter_scatter_mode()
+        pacman.last_ate_power = False
+    
+    # Then update ghosts and check collisions (ghosts profile their own path/move split)
+    update_ghosts(ghosts)
+    
+    t0 = PROFILER.mark()
+    prev_lives = level.get_lives()
+    # Only ghosts near Pacman get the exact collision test
+    for g in level.collision_candidates(pacman, ghosts):
+        level.check_collision_and_reset(pacman, g)
+        if level.is_game_over():
+            break
+        if level.get_lives() < prev_lives:
+            # life lost: reset all ghosts to spawn to avoid instant re-collision
+            for gg in ghosts:
+                if hasattr(gg, 'reset_to_spawn'):
+                    gg.reset_to_spawn()
+            break
+    PROFILER.add("collision", t0)
+    
+    # After movement/collisions, check level completion and handle restart/speed-up
+    level.check_level_completion(pacman, ghosts)
+
+def run_game(replayer=None, speed=1.0):
+    """Main game loop.
+
+    With a replay.InputReplayer the recorded session is played back (at `speed`
+    times real time) instead of reading the keyboard; returns "REPLAY_OK" or
+    "REPLAY_MISMATCH" when it ends.
+    """
+    ghost_speed = GHOST_SPEED
+    initial_lives = INITIAL_LIVES
+    # All game randomness comes from one seeded source so sessions can be replayed
+    seed = random.randrange(2 ** 63)
+    if replayer is not None:
+        seed = replayer.seed
+        ghost_speed = replayer.ghost_speed
+        initial_lives = replayer.initial_lives
+        if not load_maze_by_key(replayer.maze_key):
+            print(f"Cannot replay: maze {replayer.maze_key} differs in size from the loaded maze")
+            return "REPLAY_MISMATCH"
+    rng = random.Random(seed)
+    # Replay logs don't store the ghost count: recorded sessions always use four
+    ghost_count = GHOST_COUNT if replayer is None else 4
+    recorder = None
+    if RECORD_DIR and replayer is None and ghost_count != 4:
+        print("Recording is disabled in swarm mode (PACMAN_GHOSTS)")
+    elif RECORD_DIR and replayer is None:
+        recorder = InputRecorder(new_recording_path(RECORD_DIR), seed, maze.CURRENT_MAZE_KEY, ghost_speed, initial_lives)
+        print("Recording session to", recorder.path)
+
     # Create game objects
     pacman = Pacman()
     
+    # Simulation clock: advances SIM_STEP_MS per logic step, not with the wall clock,
+    # so ghost timers stay in step with gameplay (and pause while the menu is open)
+    sim_step_ms = 1000.0 / SIM_HZ
+    sim_time_ms = 0.0
+    sim_steps = 0
+
+    def sim_ticks():
+        return int(sim_time_ms)
+
     # Create Ghosts
-    red_ghost = Ghost(color=(255, 0, 0), pacman=pacman, speed=GHOST_SPEED, 
-                     spawn_values={5}, sprite_variant="red", behavior="blinky")
-    blue_ghost = Ghost(color=(0, 0, 255), pacman=pacman, speed=GHOST_SPEED, 
-                      spawn_values={6}, sprite_variant="blue", behavior="inky", partner=red_ghost)
-    orenge_ghost = Ghost(color=(255, 165, 0), pacman=pacman, speed=GHOST_SPEED, 
-                        spawn_values={7}, sprite_variant="orenge", behavior="clyde")
-    pink_ghost = Ghost(color=(255, 105, 180), pacman=pacman, speed=GHOST_SPEED, 
-                      spawn_values={8}, sprite_variant="pink", behavior="pinky")
-    
-    ghosts = [red_ghost, blue_ghost, orenge_ghost, pink_ghost]
+    ghosts = create_ghosts(pacman, speed=ghost_speed, clock=sim_ticks, rng=rng, count=ghost_count)
+    # Swarm mode shows its frame rate and per-frame work time at the bottom-left
+    readout = FrameRateReadout(f"{ghost_count} ghosts") if ghost_count > 4 else None
     
     # Level/Lives system
-    level = LevelSystem(initial_lives=INITIAL_LIVES)
+    level = LevelSystem(initial_lives=initial_lives, rng=rng)
     
     # Game loop
     clock = pygame.time.Clock()
     game_running = True
+    # Rects drawn last frame (erased and re-sent this frame) and a full-redraw request
+    prev_dirty = []
+    full_redraw = True
+    # Unsimulated real time carried between frames
+    accumulator_ms = 0.0
+    # Fast replays need more simulation steps per rendered frame
+    max_steps = max(MAX_SIM_STEPS_PER_FRAME, int(speed) + 1)
+    if PROFILE_FRAMES or PROFILE_DUMP_PATH:
+        PROFILER.enable(PROFILE_DUMP_PATH)
     
-    while game_running:
-        # Event handling
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+    try:
+        while game_running:
+            frame_start = time.perf_counter()
+            PROFILER.begin_frame()
+            t0 = PROFILER.mark()
+            # Event handling
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
             
-            # Handle ESC key for pause menu
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    action = menu.show_in_game_menu(pacman.pallet_count)
-                    if action == "CONTINUE":
-                        continue
-                    elif action == "NEW_GAME":
-                        # Start a new game immediately
-                        reset_maze()
-                        return "NEW_GAME"  # This tells main to start a new game
-                    elif action == "LOGOUT":
-                        return "LOGOUT"
+                # Handle ESC key for pause menu
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        if replayer is not None:
+                            print("Replay stopped")
+                            return "REPLAY_STOPPED"
+                        action = menu.show_in_game_menu(pacman.pallet_count)
+                        if action == "CONTINUE":
+                            # The pause overlay covered the whole window
+                            full_redraw = True
+                            # Don't simulate the time spent paused
+                            clock.tick()
+                            accumulator_ms = 0.0
+                            # Restart the frame record so the pause isn't charged to input
+                            PROFILER.begin_frame()
+                            t0 = PROFILER.mark()
+                            frame_start = time.perf_counter()
+                            continue
+                        elif action == "NEW_GAME":
+                            # Start a new game immediately
+                            reset_maze()
+                            return "NEW_GAME"  # This tells main to start a new game
+                        elif action == "LOGOUT":
+                            return "LOGOUT"
             
-            # Handle Pacman input
-            pacman.handle_input(event)
+                # Handle Pacman input (a replay feeds recorded input in the simulation loop instead)
+                if replayer is None:
+                    pacman.handle_input(event)
+                    if recorder is not None and event.type == pygame.KEYDOWN:
+                        # Inputs take effect before the next simulation step
+                        recorder.record(sim_steps, event.key)
+            PROFILER.add("input", t0)
         
-        # Only update gameplay if not game over
-        if not level.is_game_over():
-            # Update Pacman first
-            pacman.update()
-            
-            # If Pacman ate a power pellet this frame, enter scatter BEFORE collisions
-            if getattr(pacman, 'last_ate_power', False):
-                for g in ghosts:
-                    if hasattr(g, 'enter_scatter_mode'):
-                        g.enter_scatter_mode()
-                pacman.last_ate_power = False
-            
-            # Then update ghosts and check collisions
-            for g in ghosts:
-                g.update()
-            
-            prev_lives = level.get_lives()
-            for g in ghosts:
-                level.check_collision_and_reset(pacman, g)
+            # Run as many fixed simulation steps as real time calls for (bounded)
+            steps = 0
+            while accumulator_ms >= sim_step_ms and steps < max_steps:
+                # Only update gameplay if not game over
                 if level.is_game_over():
                     break
-                if level.get_lives() < prev_lives:
-                    # life lost: reset all ghosts to spawn to avoid instant re-collision
-                    for gg in ghosts:
-                        if hasattr(gg, 'reset_to_spawn'):
-                            gg.reset_to_spawn()
-                    break
-            
-            # After movement/collisions, check level completion and handle restart/speed-up
-            level.check_level_completion(pacman, ghosts)
+                if replayer is not None:
+                    if replayer.finished(sim_steps):
+                        break
+                    for key in replayer.keys_for_step(sim_steps):
+                        pacman.handle_input(pygame.event.Event(pygame.KEYDOWN, key=key))
+                update_gameplay(pacman, ghosts, level)
+                sim_time_ms += sim_step_ms
+                sim_steps += 1
+                accumulator_ms -= sim_step_ms
+                steps += 1
+            if steps == max_steps or level.is_game_over():
+                # Too far behind (or nothing left to simulate): drop the backlog
+                accumulator_ms %= sim_step_ms
+            # Fraction of a step not yet simulated, used to interpolate positions
+            alpha = accumulator_ms / sim_step_ms
         
-        # Draw everything
-        draw_smooth_map()
-        pacman.draw()
-        for g in ghosts:
-            g.draw()
-        level.draw_lives()
-        level.draw_level_title()
+            # Draw everything
+            t0 = PROFILER.mark()
+            if not DIRTY_RECT_RENDERING or full_redraw or map_cache_stale():
+                draw_smooth_map()
+                full_redraw = True
+            else:
+                # Erase last frame's sprites/HUD by repainting the map under them
+                restore_map_regions(prev_dirty)
+            t0 = PROFILER.add("map", t0)
+            dirty = []
+            dirty += pacman.draw(alpha)
+            for g in ghosts:
+                dirty += g.draw(alpha)
+            dirty += level.draw_lives()
+            dirty += level.draw_level_title()
+            dirty += PROFILER.draw_overlay(maze.screen)
+            if readout is not None:
+                dirty += readout.draw(maze.screen, (4, maze.SCREEN_HEIGHT - 18))
+            PROFILER.add("sprites", t0)
         
-        # If game over, draw overlay message on top
-        if level.is_game_over():
-            level.draw_game_over()
-            pygame.display.flip()
-            # Show game over menu
-            action = menu.show_game_over_menu(pacman.pallet_count)
-            if action == "NEW_GAME":
-                return "NEW_GAME"
-            elif action == "LOGOUT":
-                return "LOGOUT"
-            # If user clicked High Score in game over menu, it's handled within the menu
+            # If game over, draw overlay message on top
+            if level.is_game_over() and replayer is None:
+                level.draw_game_over()
+                pygame.display.flip()
+                # Show game over menu
+                action = menu.show_game_over_menu(pacman.pallet_count)
+                if action == "NEW_GAME":
+                    return "NEW_GAME"
+                elif action == "LOGOUT":
+                    return "LOGOUT"
+                # If user clicked High Score in game over menu, it's handled within the menu
+                full_redraw = True
         
-        # Update display
-        pygame.display.flip()
+            # Update display
+            t0 = PROFILER.mark()
+            if full_redraw:
+                pygame.display.flip()
+                full_redraw = False
+            else:
+                # Union of where things were last frame and where they are now
+                pygame.display.update(prev_dirty + dirty)
+            prev_dirty = dirty
+            PROFILER.add("flip", t0)
+            PROFILER.end_frame()
+            if readout is not None:
+                readout.add_frame(time.perf_counter() - frame_start, clock.get_fps())
+
+            if replayer is not None and (level.is_game_over() or replayer.finished(sim_steps)):
+                result = {"score": pacman.pallet_count, "lives": level.get_lives(), "level": level.level}
+                print("Replay finished:", result)
+                return "REPLAY_OK" if replayer.check(result) else "REPLAY_MISMATCH"
         
-        # Limit frame rate to 60 FPS
-        clock.tick(60)
+            # Limit render frame rate; elapsed real time feeds the simulation
+            accumulator_ms += clock.tick(RENDER_FPS) * speed
+    finally:
+        if recorder is not None:
+            recorder.close(sim_steps, pacman.pallet_count, level.get_lives(), level.level)
+
+def report_startup(marks):
+    """Print the time spent in each startup phase; marks is [(phase, perf_counter at its end)]."""
+    print("Startup timing:")
+    previous = STARTUP_T0
+    for phase, t in marks:
+        print(f"  {phase:<12} {(t - previous) * 1000:8.1f} ms")
+        previous = t
+    print(f"Time to first frame: {(marks[-1][1] - STARTUP_T0) * 1000:.1f} ms")
 
 def main():
     """Main application loop"""
     global menu
+    marks = [("imports", time.perf_counter())]
     
     # Initialize pygame
     pygame.init()
+    marks.append(("pygame.init", time.perf_counter()))
+    
+    # Load the mazes and open the window
+    maze.init()
+    marks.append(("maze.init", time.perf_counter()))
     
     # Initialize menu with current screen
-    menu = Menu(screen)
+    menu = Menu(maze.screen)
+    marks.append(("menu", time.perf_counter()))
+    
+    if STARTUP_TIMING:
+        def first_frame():
+            marks.append(("first frame", time.perf_counter()))
+            report_startup(marks)
+            pygame.quit()
+            sys.exit(0)
+        menu.on_first_frame = first_frame
     
     while True:
         # Show menu and get action
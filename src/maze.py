@@ -5,6 +5,9 @@ import sys
 from typing import List
 
 from paths import resource_path
+from mazepack import load_maze_pack
+from tilegrid import TileGrid
+from movetable import MoveTable
 
 # --- Configuration ---
 TILE_SIZE = 30
@@ -12,138 +15,292 @@ TILE_SIZE = 30
 # Map with string
 # Define the Map Array: 1=Wall, 2=Normal Pill, 3=Special Pill, 0=Empty Path
 
-# Get the directory of the current file and construct the path to maze.json
-try:
-    maze_file_path = resource_path("data", "maze.json")
-    with open(maze_file_path, "r", encoding="utf-8") as f:
-        y = json.load(f)
-    # Default start with Maze 01
-    map01 = y["1"]["map"]
-except FileNotFoundError as e:
-    print(f"Map file not found: {e.filename}")
-    sys.exit(1)
-except json.JSONDecodeError as e:
-    print(f"Invalid JSON in maze file at line {e.lineno}, col {e.colno}: {e.msg}")
-    sys.exit(1)
-except KeyError as e:
-    print(f"Missing expected key in maze file: {e}")
-    sys.exit(1)
-except Exception as e:
-    print(f"Unexpected error loading maze: {e}")
-    sys.exit(1)
-    
-
-
-# Convart STRING TO LIST
-MAP_DATA = [[int(j) for j in i] for i in map01]
+# Importing this module has no side effects: the maze pack is loaded and the
+# window opened by init(). Until then MAP_DATA is an empty grid and the sizes are
+# 0. MAP_DATA and the pellet/marker indexes are filled in place, so
+# `from maze import MAP_DATA` stays valid; read the sizes and `screen` as
+# maze.MAP_WIDTH / maze.screen etc. so the values set by init() are seen.
+
+# Default start with Maze 01; PACMAN_MAZE=<key> starts on another maze (tools/benchmarks)
+INITIAL_MAZE_KEY = os.environ.get("PACMAN_MAZE", "1")
+
+# data/maze.json compiled into a binary pack (cached by content hash) and mmap'd,
+# so loading a maze is a slice instead of a parse
+MAZE_PACK = None
+
+# One byte per tile in a single buffer; MAP_DATA[y][x] indexing works as before
+MAP_DATA = TileGrid(0, 0)
 # Keep an original copy to allow level resets without breaking imports
-ORIGINAL_MAP_DATA = [row.copy() for row in MAP_DATA]
+ORIGINAL_MAP_DATA = MAP_DATA.copy()
+# Key (in maze.json) of the layout currently held in MAP_DATA
+CURRENT_MAZE_KEY = None
+
+MAP_WIDTH = 0
+MAP_HEIGHT = 0
+
+SCREEN_WIDTH = 0
+SCREEN_HEIGHT = 0
+
+# Headless mode (PACMAN_HEADLESS=1 or init(headless=True)) runs the game logic
+# without opening a window; screen stays None and nothing may be drawn.
+HEADLESS = os.environ.get("PACMAN_HEADLESS") == "1"
+screen = None
+
+# --- Color Definitions ---
+WALL_BORDER_COLOR = (0, 0, 255) # Blue (The border color)
+WALL_BODY_COLOR = (216, 216, 230) # Light Blue (The wall interior color)
+PATH_COLOR = (0, 0, 0) # Black
+NORMAL_PILL_COLOR = (255, 255, 0) # Yellow
+SPECIAL_PILL_COLOR = (255, 165, 0) # Orange/Power
 
-MAP_WIDTH = len(MAP_DATA[0])
-MAP_HEIGHT = len(MAP_DATA)
+# Define the thickness of the border (e.g., 2 pixels on each side)
+BORDER_THICKNESS = 4
+PILL_RADIUS = 4
+POWER_RADIUS = 8
 
-SCREEN_WIDTH = MAP_WIDTH * TILE_SIZE
-SCREEN_HEIGHT = MAP_HEIGHT * TILE_SIZE
+# Cached render layers. Walls never change within a level, so the static layer
+# (walls + path background) is built once per maze; the map layer is a copy of it
+# with pellets drawn on top, patched tile-by-tile as pellets are eaten.
+_static_layer = None
+_map_layer = None
 
-# --- Pygame Initialization ---
+# Pellet index for the current MAP_DATA: (x, y) tiles still holding a normal (2) or
+# power (3) pellet. Kept in sync by clear_tile and rebuilt on reset/load, so the
+# remaining count is O(1). The set objects are updated in place so imports stay valid.
+PELLET_TILES = set()
+POWER_PELLET_TILES = set()
+
+# Marker tiles (9 = Pacman start, 5-8 = ghost spawns) -> their (x, y) in row-major
+# order. Markers are never cleared from the map, so this only changes on maze load.
+SPECIAL_TILE_VALUES = (5, 6, 7, 8, 9)
+SPECIAL_TILES = {}
+
+# Legal moves and tunnel rows of the current layout (see movetable.py). Walls only
+# change on maze load; the table is updated in place so imports stay valid.
+MOVE_TABLE = MoveTable()
+# Built move tables keyed by maze key, so switching back to a maze skips the rebuild
+_move_table_cache = {}
 
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption('Pacman')
 
 # --- Functions ---
 
-def draw_smooth_map():
-    # Count total points
-    TOTAL_POINT = 0
-    
-    # --- Color Definitions ---
-    WALL_BORDER_COLOR = (0, 0, 255) # Blue (The border color)
-    WALL_BODY_COLOR = (216, 216, 230) # Light Blue (The wall interior color)
-    PATH_COLOR = (0, 0, 0) # Black
-    NORMAL_PILL_COLOR = (255, 255, 0) # Yellow
-    SPECIAL_PILL_COLOR = (255, 165, 0) # Orange/Power
-
-    # 1. Fill the entire screen with the WALL_BORDER_COLOR. 
-    # This acts as the *base layer* for both the walls' border and the path's background.
-    screen.fill(WALL_BORDER_COLOR)
-
-    # Define the thickness of the border (e.g., 2 pixels on each side)
-    BORDER_THICKNESS = 4 
+def _draw_static_tile(surface, col_index, row_index, tile_value):
+    x = col_index * TILE_SIZE
+    y = row_index * TILE_SIZE
+    if tile_value == 1:
+        # --- WALL TILE DRAWING (Bordered) ---
+        # Draw the Light Blue wall body *inside* the Blue border area.
+        # The rectangle is shifted inward by BORDER_THICKNESS/2
+        # and reduced in size by BORDER_THICKNESS to create the border effect.
+        wall_rect = pygame.Rect(
+            x + BORDER_THICKNESS // 2,
+            y + BORDER_THICKNESS // 2,
+            TILE_SIZE - BORDER_THICKNESS,
+            TILE_SIZE - BORDER_THICKNESS
+        )
+        pygame.draw.rect(surface, WALL_BODY_COLOR, wall_rect)
+    elif tile_value in [0, 2, 3, 5, 6, 7, 8, 9]:
+        # --- PATH TILE DRAWING ---
+        # Draw a black rectangle that covers the tile space entirely
+        path_rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
+        pygame.draw.rect(surface, PATH_COLOR, path_rect)
+
 
+def _draw_pellet(surface, col_index, row_index, tile_value):
+    center_x = col_index * TILE_SIZE + TILE_SIZE // 2
+    center_y = row_index * TILE_SIZE + TILE_SIZE // 2
+    if tile_value == 2:
+        pygame.draw.circle(surface, NORMAL_PILL_COLOR, (center_x, center_y), PILL_RADIUS)
+    elif tile_value == 3:
+        pygame.draw.circle(surface, SPECIAL_PILL_COLOR, (center_x, center_y), POWER_RADIUS)
+
+
+def _build_layers():
+    """Render the static wall layer and the pellet layer for the current MAP_DATA."""
+    global _static_layer, _map_layer
+    static = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    # Fill with the WALL_BORDER_COLOR. This acts as the *base layer*
+    # for both the walls' border and the path's background.
+    static.fill(WALL_BORDER_COLOR)
     for row_index, row in enumerate(MAP_DATA):
         for col_index, tile_value in enumerate(row):
-            x = col_index * TILE_SIZE
-            y = row_index * TILE_SIZE
-            center_x = x + TILE_SIZE // 2
-            center_y = y + TILE_SIZE // 2
-
-            if tile_value == 1:
-                # --- WALL TILE DRAWING (Bordered) ---
-                # Draw the Light Blue wall body *inside* the Blue border area
-                
-                # New rectangle is shifted inward by BORDER_THICKNESS/2 
-                # and reduced in size by BORDER_THICKNESS to create the border effect.
-                wall_rect = pygame.Rect(
-                    x + BORDER_THICKNESS // 2, 
-                    y + BORDER_THICKNESS // 2, 
-                    TILE_SIZE - BORDER_THICKNESS, 
-                    TILE_SIZE - BORDER_THICKNESS
-                )
-                pygame.draw.rect(screen, WALL_BODY_COLOR, wall_rect)
-
-            elif tile_value in [0, 2, 3, 5, 6, 7, 8, 9]:
-                # --- PATH TILE DRAWING ---
-                # Draw a black rectangle that covers the tile space entirely
-                # (You used TILE_SIZE+4 previously, TILE_SIZE should be fine 
-                # unless you want overlapping paths)
-                path_rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-                pygame.draw.rect(screen, PATH_COLOR, path_rect) 
-                
-                # Now, draw the pills on the black path
-                if tile_value == 2:
-                    TOTAL_POINT+=10
-                    PILL_RADIUS = 4
-                    pygame.draw.circle(screen, NORMAL_PILL_COLOR, (center_x, center_y), PILL_RADIUS)
-                
-                elif tile_value == 3:
-                    TOTAL_POINT+=50
-                    POWER_RADIUS = 8
-                    pygame.draw.circle(screen, SPECIAL_PILL_COLOR, (center_x, center_y), POWER_RADIUS)# --- Main Game Loop ---
-    
+            _draw_static_tile(static, col_index, row_index, tile_value)
+    layer = static.copy()
+    for col_index, row_index in PELLET_TILES:
+        _draw_pellet(layer, col_index, row_index, 2)
+    for col_index, row_index in POWER_PELLET_TILES:
+        _draw_pellet(layer, col_index, row_index, 3)
+    _static_layer = static
+    _map_layer = layer
+
+
+def _load_move_table():
+    """Point MOVE_TABLE at the current maze's table, building it once per key."""
+    table = _move_table_cache.get(CURRENT_MAZE_KEY)
+    if table is None:
+        table = MoveTable()
+        table.build(MAP_DATA)
+        _move_table_cache[CURRENT_MAZE_KEY] = table
+    MOVE_TABLE.use(table)
+
+
+def invalidate_map_cache():
+    """Drop the cached render layers; they are rebuilt on the next draw."""
+    global _static_layer, _map_layer
+    _static_layer = None
+    _map_layer = None
+
+
+def _rebuild_pellet_index():
+    PELLET_TILES.clear()
+    PELLET_TILES.update(MAP_DATA.positions(2))
+    POWER_PELLET_TILES.clear()
+    POWER_PELLET_TILES.update(MAP_DATA.positions(3))
+
+
+def _rebuild_special_index():
+    SPECIAL_TILES.clear()
+    for value in SPECIAL_TILE_VALUES:
+        SPECIAL_TILES[value] = MAP_DATA.positions(value)
+
+
+def tiles_with_value(*values):
+    """(x, y) of every tile holding one of values, in row-major order.
+
+    Marker values come from the index; any other value falls back to a buffer scan.
+    """
+    found = [SPECIAL_TILES[v] if v in SPECIAL_TILES else MAP_DATA.positions(v) for v in values]
+    if len(found) == 1:
+        return list(found[0])
+    tiles = [tile for value_tiles in found for tile in value_tiles]
+    tiles.sort(key=lambda t: (t[1], t[0]))
+    return tiles
+
+
+def remaining_pellets() -> int:
+    """Number of normal + power pellets left in the current maze."""
+    return len(PELLET_TILES) + len(POWER_PELLET_TILES)
+
+
+def nearest_pellet(x: int, y: int, power_only: bool = False):
+    """Return the remaining pellet tile closest to (x, y) by Manhattan distance, or None."""
+    candidates = POWER_PELLET_TILES if power_only else PELLET_TILES | POWER_PELLET_TILES
+    best = None
+    best_dist = None
+    for tile in candidates:
+        d = abs(tile[0] - x) + abs(tile[1] - y)
+        if best_dist is None or d < best_dist:
+            best = tile
+            best_dist = d
+    return best
+
+
+def clear_tile(x: int, y: int):
+    """Set a tile to empty path, drop it from the pellet index and patch the
+    cached pellet layer for that tile only."""
+    MAP_DATA[y][x] = 0
+    PELLET_TILES.discard((x, y))
+    POWER_PELLET_TILES.discard((x, y))
+    if _map_layer is not None:
+        rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        _map_layer.blit(_static_layer, rect, rect)
+
+
+def draw_smooth_map():
+    if _map_layer is None:
+        _build_layers()
+    screen.blit(_map_layer, (0, 0))
+    return screen
+
+
+def map_cache_stale() -> bool:
+    """True when the cached layers were dropped and the next draw must cover the whole screen."""
+    return _map_layer is None
+
+
+def restore_map_regions(rects):
+    """Repaint only the given screen rects from the cached map layer (dirty-rect erase)."""
+    if _map_layer is None:
+        _build_layers()
+    for rect in rects:
+        screen.blit(_map_layer, rect, rect)
+
+def _load_pack():
+    """Load the compiled maze pack, exiting with a message if the maze file is unusable."""
+    try:
+        maze_file_path = resource_path("data", "maze.json")
+        return load_maze_pack(maze_file_path)
+    except FileNotFoundError as e:
+        print(f"Map file not found: {e.filename}")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Invalid JSON in maze file at line {e.lineno}, col {e.colno}: {e.msg}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Invalid maze data: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Unexpected error loading maze: {e}")
+        sys.exit(1)
+
+
+def is_initialized() -> bool:
+    return MAZE_PACK is not None
+
+
+def init(maze_key=None, headless=None):
+    """Load the maze pack, select the starting maze and (unless headless) open the window.
+
+    Later calls are no-ops. maze_key defaults to INITIAL_MAZE_KEY and headless to
+    PACMAN_HEADLESS. Returns the display surface (None when headless).
+    """
+    global MAZE_PACK, ORIGINAL_MAP_DATA, CURRENT_MAZE_KEY, INITIAL_MAZE_KEY
+    global MAP_WIDTH, MAP_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT, HEADLESS, screen
+    if MAZE_PACK is not None:
+        return screen
+    pack = _load_pack()
+    try:
+        key = str(int(maze_key if maze_key is not None else INITIAL_MAZE_KEY))
+    except ValueError:
+        key = None
+    if key not in pack:
+        print(f"Missing expected key in maze file: {maze_key if maze_key is not None else INITIAL_MAZE_KEY}")
+        sys.exit(1)
+    MAZE_PACK = pack
+    INITIAL_MAZE_KEY = key
+    CURRENT_MAZE_KEY = key
+    MAP_HEIGHT, MAP_WIDTH = pack.dims(key)
+    MAP_DATA.reshape(MAP_WIDTH, MAP_HEIGHT, pack.grid(key))
+    ORIGINAL_MAP_DATA = MAP_DATA.copy()
+    SCREEN_WIDTH = MAP_WIDTH * TILE_SIZE
+    SCREEN_HEIGHT = MAP_HEIGHT * TILE_SIZE
+    _rebuild_pellet_index()
+    _rebuild_special_index()
+    _load_move_table()
+    invalidate_map_cache()
+
+    if headless is not None:
+        HEADLESS = headless
+    if not HEADLESS:
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption('Pacman')
     return screen
 
+
 def reset_maze():
     """Reset MAP_DATA to the original layout in-place so imports stay valid."""
-    global MAP_DATA, ORIGINAL_MAP_DATA
-    height = len(MAP_DATA)
-    width = len(MAP_DATA[0]) if height > 0 else 0
-    for y in range(height):
-        # Ensure row length matches
-        for x in range(width):
-            MAP_DATA[y][x] = ORIGINAL_MAP_DATA[y][x]
-    # No return value needed
+    MAP_DATA.load(ORIGINAL_MAP_DATA)
+    # Pellets are restored, so the index and cached layers must be rebuilt
+    _rebuild_pellet_index()
+    invalidate_map_cache()
 
 
 # --- Maze selection helpers ---
 
-def _convert_map_str_list(str_rows: List[str]) -> List[List[int]]:
-    return [[int(ch) for ch in row] for row in str_rows]
-
 def get_same_size_maze_keys() -> List[str]:
     """Return maze keys whose map dimensions match the current MAP dimensions."""
     try:
-        keys = []
-        cur_h = len(MAP_DATA)
-        cur_w = len(MAP_DATA[0]) if cur_h > 0 else 0
-        for key, obj in y.items():
-            str_rows = obj.get("map")
-            if not isinstance(str_rows, list):
-                continue
-            h = len(str_rows)
-            w = len(str_rows[0]) if h > 0 else 0
-            if h == cur_h and w == cur_w:
-                keys.append(str(key))
-        return sorted(keys, key=lambda k: int(k))
+        return MAZE_PACK.keys_with_size(MAP_DATA.height, MAP_DATA.width)
     except Exception:
         return ["1"]
 
@@ -153,28 +310,26 @@ def load_maze_by_key(key: str) -> bool:
     Returns True on success, False if key missing or size mismatch.
     Also resets ORIGINAL_MAP_DATA to the newly loaded maze for level resets.
     """
-    global MAP_DATA, ORIGINAL_MAP_DATA
+    global ORIGINAL_MAP_DATA, CURRENT_MAZE_KEY
     try:
-        obj = y[str(int(key))]
-        str_rows = obj.get("map")
-        if not isinstance(str_rows, list):
+        key = str(int(key))
+        if key not in MAZE_PACK:
             return False
-        new_map = _convert_map_str_list(str_rows)
         # Only allow switch if size matches current SCREEN/MAP to avoid cross-module dimension issues
-        if len(new_map) != len(MAP_DATA) or len(new_map[0]) != len(MAP_DATA[0]):
+        if MAZE_PACK.dims(key) != (MAP_DATA.height, MAP_DATA.width):
             # Size mismatch: do not switch to avoid breaking imports
             return False
-        # Replace MAP_DATA in-place to preserve imported reference
-        height = len(MAP_DATA)
-        width = len(MAP_DATA[0]) if height > 0 else 0
-        for y_idx in range(height):
-            for x_idx in range(width):
-                MAP_DATA[y_idx][x_idx] = new_map[y_idx][x_idx]
+        # Replace MAP_DATA in-place (one buffer copy) to preserve imported reference
+        MAP_DATA.load(MAZE_PACK.grid(key))
         # Update ORIGINAL to this maze so reset_maze restores this layout during the level
-        ORIGINAL_MAP_DATA = [row.copy() for row in MAP_DATA]
+        ORIGINAL_MAP_DATA = MAP_DATA.copy()
+        CURRENT_MAZE_KEY = key
+        _rebuild_pellet_index()
+        _rebuild_special_index()
+        _load_move_table()
+        invalidate_map_cache()
         return True
     except Exception as e:
         print("Failed to load maze key:", key, e)
         return False
 
-
@@ -0,0 +1,139 @@
+# mazepack.py
+"""Compiled maze pack: data/maze.json compiled once into a binary file and mmap'd.
+
+Layout (little-endian):
+    header   "<4sHH"   magic b"PMZ1", format version, maze count
+    entries  "<HHHI"   per maze: key, height, width, byte offset of its grid
+    grids    one byte per cell (the tile value 0-9), row-major
+
+The pack is cached in the user cache directory under a name derived from the
+SHA-256 of maze.json, so a changed maze file compiles a new pack and an unchanged
+one is never parsed again: startup reads the raw JSON bytes only to hash them, and
+selecting a maze is a slice of the mapped file.
+"""
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+MAGIC = b"PMZ1"
+VERSION = 1
+_HEADER = struct.Struct("<4sHH")
+_ENTRY = struct.Struct("<HHHI")
+
+
+def _cache_dir() -> str:
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    cache_root = os.path.expanduser(xdg_cache_home) if xdg_cache_home else os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_root, "pacman_game")
+
+
+def compile_mazes(mazes: dict) -> bytes:
+    """Compile the parsed maze.json object ({key: {"map": [rows]}}) into pack bytes."""
+    grids = []
+    for key in sorted(mazes, key=int):
+        rows = mazes[key].get("map")
+        if not isinstance(rows, list) or not rows:
+            raise ValueError(f"Maze {key} has no map rows")
+        width = len(rows[0])
+        if any(len(row) != width for row in rows):
+            raise ValueError(f"Maze {key} has rows of different lengths")
+        cells = "".join(rows)
+        if not cells.isdigit():
+            raise ValueError(f"Maze {key} contains non-digit tiles")
+        grids.append((int(key), len(rows), width, bytes(int(ch) for ch in cells)))
+
+    data_offset = _HEADER.size + _ENTRY.size * len(grids)
+    parts = [_HEADER.pack(MAGIC, VERSION, len(grids))]
+    offset = data_offset
+    for key, height, width, grid in grids:
+        parts.append(_ENTRY.pack(key, height, width, offset))
+        offset += len(grid)
+    parts.extend(grid for _, _, _, grid in grids)
+    return b"".join(parts)
+
+
+class MazePack:
+    """Read-only view over compiled pack bytes (an mmap or a bytes object)."""
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        magic, version, count = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a compatible maze pack")
+        # key -> (height, width, offset)
+        self._index = {}
+        for i in range(count):
+            key, height, width, offset = _ENTRY.unpack_from(buffer, _HEADER.size + i * _ENTRY.size)
+            self._index[str(key)] = (height, width, offset)
+
+    def keys(self):
+        """Maze keys in numeric order."""
+        return sorted(self._index, key=int)
+
+    def __contains__(self, key) -> bool:
+        return str(key) in self._index
+
+    def dims(self, key):
+        """Return (height, width) of a maze."""
+        height, width, _ = self._index[str(key)]
+        return height, width
+
+    def grid(self, key) -> memoryview:
+        """Row-major tile bytes of a maze (zero-copy slice of the pack)."""
+        height, width, offset = self._index[str(key)]
+        return self._view[offset:offset + height * width]
+
+    def rows(self, key):
+        """Maze as a list of rows of ints (the MAP_DATA layout)."""
+        height, width, offset = self._index[str(key)]
+        view = self._view
+        return [list(view[offset + r * width:offset + (r + 1) * width]) for r in range(height)]
+
+    def keys_with_size(self, height: int, width: int):
+        """Keys of all mazes with the given dimensions, in numeric order."""
+        return [key for key in self.keys() if self._index[key][:2] == (height, width)]
+
+
+def load_maze_pack(json_path: str) -> MazePack:
+    """Return the pack for json_path, compiling and caching it if the content changed.
+
+    Raises FileNotFoundError / json.JSONDecodeError / ValueError for a missing or
+    invalid maze file. If the cache directory is not writable the pack is kept in
+    memory instead of being mapped from disk.
+    """
+    with open(json_path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()[:16]
+    cache_dir = _cache_dir()
+    pack_path = os.path.join(cache_dir, f"maze-{digest}.pack")
+
+    if os.path.exists(pack_path):
+        try:
+            with open(pack_path, "rb") as f:
+                return MazePack(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Ignoring unreadable maze pack {pack_path}: {e}")
+
+    data = compile_mazes(json.loads(raw.decode("utf-8")))
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{pack_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, pack_path)
+        # Drop packs compiled from older versions of the maze file
+        for stale in glob.glob(os.path.join(cache_dir, "maze-*.pack")):
+            if stale != pack_path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+        with open(pack_path, "rb") as f:
+            return MazePack(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    except OSError as e:
+        print(f"Maze pack cache unavailable ({e}); using in-memory pack")
+        return MazePack(data)
@@ -1,10 +1,11 @@
 # menu.py
 import pygame
-import json
 import sys
 import os
 
 from paths import resource_path
+from store import Leaderboard, open_store
+from text import get_font, render_text
 
 # --- Constants ---
 WHITE = (255, 255, 255)
@@ -21,18 +22,22 @@ DARK_RED = (180, 0, 0)
 PURPLE = (128, 0, 128)
 ORANGE = (255, 165, 0)
 
-# Initialize Fonts
-pygame.font.init()
-try:
-    FONT = pygame.font.Font(None, 32)
-    SMALL_FONT = pygame.font.Font(None, 24)
-    TITLE_FONT = pygame.font.Font(None, 48)
-    BIG_FONT = pygame.font.Font(None, 64)
-except:
-    FONT = pygame.font.SysFont("arial", 32)
-    SMALL_FONT = pygame.font.SysFont("arial", 24)
-    TITLE_FONT = pygame.font.SysFont("arial", 48)
-    BIG_FONT = pygame.font.SysFont("arial", 64)
+# Fonts (pygame's default font), loaded by init_fonts() when the first Menu is created
+FONT = None
+SMALL_FONT = None
+TITLE_FONT = None
+BIG_FONT = None
+
+
+def init_fonts():
+    """Load the menu fonts (once)."""
+    global FONT, SMALL_FONT, TITLE_FONT, BIG_FONT
+    if FONT is not None:
+        return
+    FONT = get_font(32, None)
+    SMALL_FONT = get_font(24, None)
+    TITLE_FONT = get_font(48, None)
+    BIG_FONT = get_font(64, None)
 
 # --- UI Classes ---
 
@@ -111,7 +116,7 @@ class Button:
         self.text = text
         self.color = color
         self.text_color = text_color
-        self.txt_surface = FONT.render(text, True, text_color)
+        self.txt_surface = render_text(FONT, text, text_color)
         self.is_hovered = False
 
     def draw(self, screen):
@@ -137,6 +142,7 @@ class Button:
 
 class Menu:
     def __init__(self, screen):
+        init_fonts()
         self.screen = screen
         self.screen_width, self.screen_height = screen.get_size()
         self.state = "MAIN"  # States: MAIN, LOGIN, SIGNUP, DASHBOARD, HIGHSCORE, IN_GAME_MENU, GAME_OVER
@@ -161,61 +167,28 @@ class Menu:
             except Exception as e:
                 print(f"Error creating data directory: {e}")
 
-        self.user_file = os.path.join(data_dir, "user.json")
-        self.score_file = os.path.join(data_dir, "score.json")
-
         # Paths to bundled default data (read-only)
         self.default_user_file = resource_path("src", "info", "user.json")
         self.default_score_file = resource_path("src", "info", "score.json")
         
-        print(f"User file: {self.user_file}")
-        print(f"Score file: {self.score_file}")
+        # Accounts and best scores (SQLite by default; see store.py)
+        self.store = open_store(data_dir, self.default_user_file, self.default_score_file)
+        self.leaderboard = Leaderboard(self.store, size=10)
+        # Rendered high score screen (minus buttons) and the state it was rendered for
+        self._highscore_surface = None
+        self._highscore_key = None
         
-        self.users = self.load_json(self.user_file, self.default_user_file)
-        self.scores = self.load_json(self.score_file, self.default_score_file)
-        
-        print(f"Loaded {len(self.users)} users")
-        print(f"Loaded {len(self.scores)} scores")
+        print(f"Loaded {self.store.user_count()} users")
+        print(f"Loaded {self.store.score_count()} scores")
         
         self.inputs = []
         self.buttons = []
+        # Called once after the first menu frame is shown (startup timing)
+        self.on_first_frame = None
         
         # Initialize UI elements
         self.init_ui()
 
-    def load_json(self, filepath, default_path=None):
-        """Load JSON data from file, seeding from a bundled default if present."""
-        try:
-            if os.path.exists(filepath):
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                    return data
-            else:
-                seed_data = {}
-                if default_path and os.path.exists(default_path):
-                    try:
-                        with open(default_path, 'r') as default_f:
-                            seed_data = json.load(default_f)
-                    except Exception as e:
-                        print(f"Failed to read default data from {default_path}: {e}")
-                print(f"File {filepath} doesn't exist, creating from defaults")
-                with open(filepath, 'w') as f:
-                    json.dump(seed_data, f)
-                return seed_data
-        except Exception as e:
-            print(f"Error loading {filepath}: {e}")
-            return {}
-
-    def save_json(self, filepath, data):
-        """Save JSON data to file"""
-        try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=4)
-            return True
-        except Exception as e:
-            print(f"Error saving {filepath}: {e}")
-            return False
-
     def show_message(self, msg, color=GREEN, duration=3000):
         """Show a temporary message"""
         self.message = msg
@@ -277,6 +250,8 @@ class Menu:
             self.buttons.append(Button(center_x - 100, start_y + 140, 200, 50, "Logout", RED))
         
         elif self.state == "HIGHSCORE":
+            # Pick up scores other game processes wrote to the shared database
+            self.leaderboard.reload()
             # High Score Screen - ONLY BACK BUTTON
             self.buttons.append(Button(center_x - 100, self.screen_height - 100, 200, 50, "Back", GRAY))
         
@@ -295,40 +270,58 @@ class Menu:
             self.buttons.append(Button(center_x - 100, center_y + 50, 200, 50, "High Score", BLUE))
             self.buttons.append(Button(center_x - 100, center_y + 120, 200, 50, "Logout", RED))
 
-    def draw_text(self, text, y, color=WHITE, font=FONT, center=True, x_offset=0):
-        """Helper function to draw text on screen"""
-        surf = font.render(text, True, color)
+    def draw_text(self, text, y, color=WHITE, font=None, center=True, x_offset=0, surface=None):
+        """Helper function to draw text on screen (or on surface)"""
+        font = font or FONT
+        target = surface if surface is not None else self.screen
+        surf = render_text(font, text, color)
         if center:
             rect = surf.get_rect(center=(self.screen_width // 2 + x_offset, y))
-            self.screen.blit(surf, rect)
+            target.blit(surf, rect)
         else:
-            self.screen.blit(surf, (20 + x_offset, y))
+            target.blit(surf, (20 + x_offset, y))
 
     def show_highscore_screen(self):
         """Display high score screen with proper spacing"""
-        self.screen.fill(BLACK)
+        # The leaderboard is only re-rendered when the ranking or the highlighted user changes
+        key = (self.leaderboard.version, self.username, self.screen.get_size())
+        if self._highscore_surface is None or self._highscore_key != key:
+            self._highscore_surface = self._render_highscore_surface()
+            self._highscore_key = key
+        self.screen.blit(self._highscore_surface, (0, 0))
+        
+        # Draw only the back button (no other buttons)
+        for btn in self.buttons:
+            btn.draw(self.screen)
+        
+        pygame.display.flip()
+
+    def _render_highscore_surface(self):
+        """Render title, headers and the top 10 rows onto a screen-sized surface"""
+        surface = pygame.Surface(self.screen.get_size()).convert()
+        surface.fill(BLACK)
         
         # Title
-        self.draw_text("HIGH SCORES", 60, YELLOW, TITLE_FONT)
+        self.draw_text("HIGH SCORES", 60, YELLOW, TITLE_FONT, surface=surface)
         
         # Draw scores with proper spacing - leave room at bottom for button
         y_pos = 130
         
-        # Sort scores by value (descending) - higher score gets higher position
-        sorted_scores = sorted(self.scores.items(), key=lambda x: x[1], reverse=True)
+        # Top 10 by score (descending) - higher score gets higher position
+        sorted_scores = self.leaderboard.entries()
         
         if not sorted_scores:
-            self.draw_text("No scores yet! Play a game!", 200, WHITE, FONT)
+            self.draw_text("No scores yet! Play a game!", 200, WHITE, FONT, surface=surface)
         else:
             # Draw column headers
-            self.draw_text("Rank", y_pos, ORANGE, SMALL_FONT, center=True, x_offset=-150)
-            self.draw_text("Player", y_pos, ORANGE, SMALL_FONT, center=True, x_offset=-50)
-            self.draw_text("Score", y_pos, ORANGE, SMALL_FONT, center=True, x_offset=100)
+            self.draw_text("Rank", y_pos, ORANGE, SMALL_FONT, center=True, x_offset=-150, surface=surface)
+            self.draw_text("Player", y_pos, ORANGE, SMALL_FONT, center=True, x_offset=-50, surface=surface)
+            self.draw_text("Score", y_pos, ORANGE, SMALL_FONT, center=True, x_offset=100, surface=surface)
             
             y_pos += 40
             
             # Draw a separator line
-            pygame.draw.line(self.screen, GRAY, 
+            pygame.draw.line(surface, GRAY, 
                            (self.screen_width // 2 - 200, y_pos - 10),
                            (self.screen_width // 2 + 200, y_pos - 10), 2)
             
@@ -347,7 +340,7 @@ class Menu:
                         self.screen_width // 2 - 200, y_pos - 15,
                         400, 35
                     )
-                    pygame.draw.rect(self.screen, DARK_BLUE, highlight_rect, border_radius=5)
+                    pygame.draw.rect(surface, DARK_BLUE, highlight_rect, border_radius=5)
                 
                 # Rank with different colors for top 3
                 if idx == 0:  # 1st place
@@ -364,26 +357,22 @@ class Menu:
                     rank_text = f"{idx + 1}th"
                 
                 # Draw rank
-                self.draw_text(rank_text, y_pos, rank_color, FONT, center=True, x_offset=-150)
+                self.draw_text(rank_text, y_pos, rank_color, FONT, center=True, x_offset=-150, surface=surface)
                 
                 # Draw username (current user in different color)
                 username_color = YELLOW if username == self.username else WHITE
                 # Truncate long usernames
                 display_username = username[:15] + "..." if len(username) > 15 else username
-                self.draw_text(display_username, y_pos, username_color, FONT, center=True, x_offset=-50)
+                self.draw_text(display_username, y_pos, username_color, FONT, center=True, x_offset=-50, surface=surface)
                 
                 # Draw score with formatting
                 score_text = f"{score:,}"  # Add commas for thousands
                 score_color = GREEN if username == self.username else WHITE
-                self.draw_text(score_text, y_pos, score_color, FONT, center=True, x_offset=100)
+                self.draw_text(score_text, y_pos, score_color, FONT, center=True, x_offset=100, surface=surface)
                 
                 y_pos += 40
         
-        # Draw only the back button (no other buttons)
-        for btn in self.buttons:
-            btn.draw(self.screen)
-        
-        pygame.display.flip()
+        return surface
 
     def handle_login(self):
         """Handle login attempt"""
@@ -395,8 +384,9 @@ class Menu:
                 self.show_message("Please enter username and password", RED)
                 return False
             
-            if username in self.users:
-                if self.users[username] == password:
+            stored_password = self.store.get_password(username)
+            if stored_password is not None:
+                if stored_password == password:
                     self.username = username
                     self.state = "DASHBOARD"
                     self.show_message(f"Welcome back, {username}!", GREEN)
@@ -428,13 +418,12 @@ class Menu:
                 self.show_message("Password must be at least 4 characters", RED)
                 return False
             
-            if username in self.users:
+            if self.store.get_password(username) is not None:
                 self.show_message("Username already exists", RED)
                 return False
             
             # Add new user
-            self.users[username] = password
-            if self.save_json(self.user_file, self.users):
+            if self.store.add_user(username, password):
                 # Show success message and clear inputs
                 self.show_message("Account created successfully! Please login.", GREEN)
                 
@@ -524,10 +513,10 @@ class Menu:
                             elif btn.text == "High Score":
                                 if self.state == "DASHBOARD":
                                     self.state = "HIGHSCORE"
-                                    self.scores = self.load_json(self.score_file)
                                     self.init_ui()
                                 elif self.state == "GAME_OVER":
                                     # Show high score and then return to game over screen
+                                    self.leaderboard.reload()
                                     self.show_highscore_screen()
                                     # Wait for click to return
                                     waiting = True
@@ -656,6 +645,9 @@ class Menu:
                     self.draw_text(self.message, self.screen_height - 50, self.message_color, SMALL_FONT)
             
             pygame.display.flip()
+            if self.on_first_frame is not None:
+                callback, self.on_first_frame = self.on_first_frame, None
+                callback()
 
     def show_in_game_menu(self, current_score):
         """Show in-game pause menu, returns action"""
@@ -759,7 +751,6 @@ class Menu:
                             elif btn.text == "High Score":
                                 # Show high scores with proper back button handling
                                 self.state = "HIGHSCORE"
-                                self.scores = self.load_json(self.score_file)
                                 self.init_ui()
                                 
                                 # Run highscore screen loop
@@ -788,8 +779,7 @@ class Menu:
                                     if self.state != "HIGHSCORE":
                                         break
                                     
-                                    # Draw highscore screen
-                                    self.screen.fill(BLACK)
+                                    # Draw highscore screen (one cached blit)
                                     self.show_highscore_screen()
                                     pygame.display.flip()
                                 
@@ -857,16 +847,11 @@ class Menu:
                         if btn.is_clicked(mouse_pos) and btn.text == "Back":
                             return
             
-            # Draw high scores
-            self.screen.fill(BLACK)
+            # Draw high scores (one cached blit)
             self.show_highscore_screen()
 
     def update_score(self, score):
         """Update the score for current user - higher scores get higher position"""
         if self.username and score > 0:
-            current_best = self.scores.get(self.username, 0)
-            if score > current_best:
-                self.scores[self.username] = score
-                self.save_json(self.score_file, self.scores)
-                return True
+            return self.leaderboard.submit(self.username, score)
         return False
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""Per-maze table of legal moves, built once when a maze is loaded.
+
+For every tile it keeps a 4-bit mask of the directions that can be taken from it
+and the tile each of those moves lands on, so movement checks and BFS neighbor
+expansion are lookups instead of bounds/wall tests:
+
+- ``masks[y * width + x]``: bit i set if moving by DIRECTIONS[i] is legal
+- ``neighbors(x, y)``: precomputed tuple of the reachable neighbor tiles
+
+Tunnels are found from the map itself: a row whose left and right edge tiles are
+both walkable and reachable from Pacman's start wraps around (the top HUD row is
+open at the edges but cut off from the maze, so it is not a tunnel).
+"""
+from collections import deque
+
+WALL = 1
+START = 9
+# Neighbor order; it decides tie-breaks between equally short routes
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+# (dx, dy) -> mask bit
+DIRECTION_BITS = {d: 1 << i for i, d in enumerate(DIRECTIONS)}
+
+
+class MoveTable:
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.masks = bytearray()
+        self.tunnel_rows = frozenset()
+        self._neighbors = []
+
+    def build(self, grid):
+        """Rebuild the table in place for grid (a TileGrid); walls are WALL tiles."""
+        width, height = grid.width, grid.height
+        buffer = grid.buffer
+        self.width = width
+        self.height = height
+        self.tunnel_rows = frozenset(_find_tunnel_rows(buffer, width, height))
+        tunnel_rows = self.tunnel_rows
+
+        masks = bytearray(width * height)
+        neighbors = []
+        for y in range(height):
+            for x in range(width):
+                mask = 0
+                found = []
+                for bit, (dx, dy) in enumerate(DIRECTIONS):
+                    nx, ny = x + dx, y + dy
+                    # Off the left/right edge of a tunnel row: come back in on the other side
+                    if dy == 0 and y in tunnel_rows:
+                        nx %= width
+                    if 0 <= nx < width and 0 <= ny < height and buffer[ny * width + nx] != WALL:
+                        mask |= 1 << bit
+                        found.append((nx, ny))
+                masks[y * width + x] = mask
+                neighbors.append(tuple(found))
+        self.masks = masks
+        self._neighbors = neighbors
+
+    def use(self, other):
+        """Take over other's built table in place (shares its data, no rebuild)."""
+        self.width = other.width
+        self.height = other.height
+        self.masks = other.masks
+        self.tunnel_rows = other.tunnel_rows
+        self._neighbors = other._neighbors
+
+    def can_move(self, x: int, y: int, dx: int, dy: int) -> bool:
+        """True if a step by (dx, dy) from tile (x, y) lands on a walkable tile."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            bit = DIRECTION_BITS.get((dx, dy))
+            return bit is not None and self.masks[y * self.width + x] & bit != 0
+        return False
+
+    def neighbors(self, x: int, y: int):
+        """Walkable tiles one step from (x, y), tunnels included (also defined for wall tiles)."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self._neighbors[y * self.width + x]
+        return ()
+
+    def step(self, x: int, y: int, dx: int, dy: int):
+        """Tile reached by one step in (dx, dy) from (x, y), or None if that move is not legal."""
+        if not self.can_move(x, y, dx, dy):
+            return None
+        nx, ny = x + dx, y + dy
+        if dy == 0 and y in self.tunnel_rows:
+            nx %= self.width
+        return nx, ny
+
+
+def _find_tunnel_rows(buffer, width, height):
+    """Rows whose two edge tiles are walkable and reachable from the start tile."""
+    if width == 0 or height == 0:
+        return []
+    start = buffer.find(START)
+    if start == -1:
+        # No start marker: every row open at both edges counts
+        reachable = None
+    else:
+        reachable = bytearray(width * height)
+        reachable[start] = 1
+        dq = deque([start])
+        while dq:
+            i = dq.popleft()
+            x, y = i % width, i // width
+            for dx, dy in DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    j = ny * width + nx
+                    if not reachable[j] and buffer[j] != WALL:
+                        reachable[j] = 1
+                        dq.append(j)
+    rows = []
+    for y in range(height):
+        left, right = y * width, y * width + width - 1
+        if buffer[left] == WALL or buffer[right] == WALL:
+            continue
+        if reachable is None or (reachable[left] and reachable[right]):
+            rows.append(y)
+    return rows
@@ -0,0 +1,154 @@
+"""Precomputed all-pairs navigation tables for a maze.
+
+A maze has at most a few hundred walkable tiles, so instead of running Dijkstra/BFS
+every time a ghost needs a route, one BFS per tile is run when the maze is loaded
+and the results are kept in flat arrays indexed by ``src * n + dst``:
+
+- ``dist``: shortest tile distance from ``src`` to ``dst`` (UNREACHABLE if none)
+- ``next_hop``: index of the first tile to step onto from ``src`` towards ``dst``
+
+Both are ``array('H')`` (2 bytes per entry), so a 400-tile maze costs about 640 KB.
+Routing queries then become O(1) lookups.
+"""
+from array import array
+from collections import deque
+
+UNREACHABLE = 0xFFFF
+NO_TILE = 0xFFFF
+
+
+class NavigationTable:
+    def __init__(self, width: int, height: int, tiles, neighbors, nodes=()):
+        """Build the tables.
+
+        tiles: walkable (x, y) tiles of the maze.
+        neighbors: callable (x, y) -> iterable of walkable neighbor tiles. Its order
+            decides tie-breaks between equally short routes.
+        nodes: graph nodes (corners/junctions); used for nearest-node lookups.
+        """
+        self.width = width
+        self.height = height
+        self.tiles = list(tiles)
+        n = len(self.tiles)
+        if n >= NO_TILE:
+            raise ValueError(f"Maze has too many walkable tiles for 16-bit tables: {n}")
+        self.size = n
+
+        # Grid -> tile index (-1 for walls / non-walkable); 32-bit, since valid
+        # indices go up to NO_TILE - 1, past the signed 16-bit range
+        self._index = array('i', [-1]) * (width * height)
+        for i, (x, y) in enumerate(self.tiles):
+            self._index[y * width + x] = i
+
+        adjacency = []
+        for x, y in self.tiles:
+            row = []
+            for nx, ny in neighbors(x, y):
+                j = self.index((nx, ny))
+                if j >= 0:
+                    row.append(j)
+            adjacency.append(row)
+
+        is_node = bytearray(n)
+        for tile in nodes:
+            j = self.index(tile)
+            if j >= 0:
+                is_node[j] = 1
+
+        self.dist = array('H')
+        self.next_hop = array('H')
+        # Nearest graph node per tile (first node reached by BFS from the tile)
+        self._nearest_node = array('H', [NO_TILE]) * n
+        for src in range(n):
+            dist, hop, nearest = self._bfs(src, adjacency, is_node)
+            self.dist.extend(dist)
+            self.next_hop.extend(hop)
+            self._nearest_node[src] = nearest
+
+    @staticmethod
+    def _bfs(src, adjacency, is_node):
+        n = len(adjacency)
+        dist = [UNREACHABLE] * n
+        hop = [NO_TILE] * n
+        nearest = src if is_node[src] else NO_TILE
+        dist[src] = 0
+        dq = deque()
+        # Neighbors of the source are their own first hop; everything else inherits it
+        for v in adjacency[src]:
+            if dist[v] == UNREACHABLE:
+                dist[v] = 1
+                hop[v] = v
+                dq.append(v)
+                if nearest == NO_TILE and is_node[v]:
+                    nearest = v
+        while dq:
+            u = dq.popleft()
+            du = dist[u] + 1
+            hu = hop[u]
+            for v in adjacency[u]:
+                if dist[v] == UNREACHABLE:
+                    dist[v] = du
+                    hop[v] = hu
+                    dq.append(v)
+                    if nearest == NO_TILE and is_node[v]:
+                        nearest = v
+        return dist, hop, nearest
+
+    def index(self, tile) -> int:
+        """Return the table index of a tile, or -1 if it is not walkable / out of bounds."""
+        x, y = tile
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self._index[y * self.width + x]
+        return -1
+
+    def distance(self, start, goal):
+        """Shortest walking distance in tiles, or None if unreachable."""
+        i = self.index(start)
+        j = self.index(goal)
+        if i < 0 or j < 0:
+            return None
+        d = self.dist[i * self.size + j]
+        return None if d == UNREACHABLE else d
+
+    def next_step(self, start, goal):
+        """Return the first tile to move onto from start towards goal (None if none)."""
+        i = self.index(start)
+        j = self.index(goal)
+        if i < 0 or j < 0:
+            return None
+        h = self.next_hop[i * self.size + j]
+        if h == NO_TILE:
+            return None
+        return self.tiles[h]
+
+    def next_node(self, start, goal, nodes):
+        """Follow the shortest route from start towards goal and return the first tile
+        on it that is in ``nodes`` (or the goal itself). None if unreachable or start == goal.
+
+        This is the second entry of a node-graph Dijkstra path, without the search.
+        """
+        i = self.index(start)
+        j = self.index(goal)
+        if i < 0 or j < 0 or i == j:
+            return None
+        size = self.size
+        tiles = self.tiles
+        next_hop = self.next_hop
+        cur = i
+        for _ in range(size):
+            cur = next_hop[cur * size + j]
+            if cur == NO_TILE:
+                return None
+            tile = tiles[cur]
+            if cur == j or tile in nodes:
+                return tile
+        return None
+
+    def nearest_node(self, tile):
+        """Return the nearest graph node to a walkable tile (None for walls)."""
+        i = self.index(tile)
+        if i < 0:
+            return None
+        k = self._nearest_node[i]
+        return None if k == NO_TILE else self.tiles[k]
+
@@ -1,13 +1,44 @@
 import pygame
 import time
 import math
-from maze import MAP_DATA, TILE_SIZE, MAP_WIDTH, MAP_HEIGHT, screen
-from paths import resource_path
+import maze
+from maze import MAP_DATA, TILE_SIZE, MOVE_TABLE, clear_tile, tiles_with_value
+from text import get_font, render_text
+from assets import get_frames
 
-# Defer font/text creation until pygame font is initialized
-font = None
-text_surface = None
-text_rect = None
+PACMAN_COLOR = (255, 255, 0)
+# Mouth animation phases pre-rendered per direction (blitted by mouth_phase)
+MOUTH_FRAMES = 16
+# (dx, dy) -> direction block in the frame list, and that direction's angle in degrees
+DIRECTION_FRAME_INDEX = {(1, 0): 0, (-1, 0): 1, (0, -1): 2, (0, 1): 3}
+DIRECTION_ANGLES = (0, 180, 90, 270)
+
+
+def build_mouth_frames(radius):
+    """Render Pacman at every direction/mouth phase, plus a closed circle, on transparent surfaces."""
+    offset = radius + 1
+    size = 2 * offset + 1
+    frames = []
+    for direction_angle in DIRECTION_ANGLES:
+        for phase_index in range(MOUTH_FRAMES):
+            # Animated mouth (0-60 degrees)
+            mouth_angle = 30 + 30 * math.sin(2 * math.pi * phase_index / MOUTH_FRAMES)
+            # The large arc is the Pacman body, not the mouth
+            start_rad = math.radians(direction_angle + mouth_angle / 2)
+            end_rad = math.radians(direction_angle - mouth_angle / 2 + 360)
+            points = [(offset, offset)]
+            num_points = 30
+            for i in range(num_points + 1):
+                angle = start_rad + (end_rad - start_rad) * i / num_points
+                # Negative sin because pygame y increases downward
+                points.append((offset + radius * math.cos(angle), offset - radius * math.sin(angle)))
+            frame = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.polygon(frame, PACMAN_COLOR, points)
+            frames.append(frame)
+    closed = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(closed, PACMAN_COLOR, (offset, offset), radius)
+    frames.append(closed)
+    return frames
 
 class Pacman:
     def __init__(self):
@@ -32,8 +63,9 @@ class Pacman:
         # Pacman's radius for drawing
         self.radius = TILE_SIZE // 2 - 2
         
-        # Mouth animation
+        # Mouth animation (frames are rendered once, on first draw)
         self.mouth_phase = 0
+        self._frames = None
         self.animation_speed = 0.25
         
         # Track if we're in a tunnel for teleportation
@@ -45,12 +77,10 @@ class Pacman:
 
     def find_start_position(self):
         """Find Pacman's starting position (tile with value 9)"""
-        for y in range(MAP_HEIGHT):
-            for x in range(MAP_WIDTH):
-                if MAP_DATA[y][x] == 9:  # 9 indicates Pacman starting position
-                    # Clear the starting marker
-                    MAP_DATA[y][x] = 0
-                    return x, y
+        start_tiles = tiles_with_value(9)
+        if start_tiles:
+            # The marker stays in the map; it is drawn and walked like an empty path
+            return start_tiles[0]
         
         # Fallback if no 9 found
         print("Warning: Pacman start position (9) not found, using default")
@@ -60,6 +90,8 @@ class Pacman:
         """Reset Pacman to starting position"""
         self.px = self.start_pos[0] * TILE_SIZE + TILE_SIZE // 2
         self.py = self.start_pos[1] * TILE_SIZE + TILE_SIZE // 2
+        # Position at the previous simulation step (for render interpolation)
+        self.prev_px, self.prev_py = self.px, self.py
         
         # Reset movement
         self.dx = 0
@@ -72,9 +104,20 @@ class Pacman:
         """Get current tile coordinates"""
         return int(self.px // TILE_SIZE), int(self.py // TILE_SIZE)
 
+    def render_pos(self, alpha=1.0):
+        """Position blended between the previous and current simulation step.
+
+        Jumps larger than a tile (tunnel wrap, respawn) are not blended.
+        """
+        dx = self.px - self.prev_px
+        dy = self.py - self.prev_py
+        if alpha >= 1.0 or abs(dx) > TILE_SIZE or abs(dy) > TILE_SIZE:
+            return self.px, self.py
+        return self.prev_px + dx * alpha, self.prev_py + dy * alpha
+
     def get_tile_at(self, x, y):
         """Get tile value at coordinates"""
-        if 0 <= x < MAP_WIDTH and 0 <= y < MAP_HEIGHT:
+        if 0 <= x < maze.MAP_WIDTH and 0 <= y < maze.MAP_HEIGHT:
             return MAP_DATA[y][x]
         return 1  # Treat out of bounds as wall
 
@@ -83,24 +126,10 @@ class Pacman:
         return self.get_tile_at(x, y) == 1
 
     def can_move_in_direction(self, dx, dy):
-        """Check if Pacman can move in a given direction"""
-        if dx == 0 and dy == 0:
-            return False
-        
+        """Check if Pacman can move in a given direction (tunnels included)"""
         current_x, current_y = self.current_tile()
-        next_x = current_x + dx
-        next_y = current_y + dy
-        
-        # Special case: tunnels (row 9)
-        if next_y == 9:  # Tunnel row
-            if next_x < 0 or next_x >= MAP_WIDTH:
-                return True
-        
-        # Check if next tile is within bounds
-        if 0 <= next_x < MAP_WIDTH and 0 <= next_y < MAP_HEIGHT:
-            return not self.is_wall(next_x, next_y)
-        
-        return False
+        # Bounds, walls and tunnel wraps are all in the maze's move table
+        return MOVE_TABLE.can_move(current_x, current_y, dx, dy)
 
     def handle_input(self, event):
         """Handle keyboard input for movement"""
@@ -116,6 +145,7 @@ class Pacman:
 
     def update(self):
         """Update Pacman's position - SIMPLE AND RELIABLE"""
+        self.prev_px, self.prev_py = self.px, self.py
         # Update mouth animation
         if self.dx != 0 or self.dy != 0:
             self.mouth_phase = (self.mouth_phase + self.animation_speed) % (2 * math.pi)
@@ -140,16 +170,16 @@ class Pacman:
             self.py = current_y * TILE_SIZE + center_y
             
             # Eat pellet at current position and count it
-            if 0 <= current_x < MAP_WIDTH and 0 <= current_y < MAP_HEIGHT:
+            if 0 <= current_x < maze.MAP_WIDTH and 0 <= current_y < maze.MAP_HEIGHT:
                 tile_value = MAP_DATA[current_y][current_x]
                 if tile_value == 2 or tile_value == 3:
-                    MAP_DATA[current_y][current_x] = 0
+                    # Clears the tile and patches only this tile of the cached map layer
+                    clear_tile(current_x, current_y)
                     if tile_value == 2:
                         self.pallet_count += 10
                     else:
                         self.pallet_count += 50
                         self.last_ate_power = True
-                    # screen.blit()
             
             # Try to change to queued direction if it's valid
             if self.can_move_in_direction(self.next_dx, self.next_dy):
@@ -199,10 +229,10 @@ class Pacman:
 
     def handle_tunnel(self):
         """Handle tunnel teleportation - SIMPLE VERSION"""
-        # Check if we're in the tunnel row (row 9)
+        # Check if we're in a tunnel row (found from the map when it was loaded)
         current_x, current_y = self.current_tile()
         
-        if current_y != 9:
+        if current_y not in MOVE_TABLE.tunnel_rows:
             self.in_tunnel = False
             return
         
@@ -214,85 +244,47 @@ class Pacman:
             # When we reach the left side of the tile
             if pixel_in_tile < TILE_SIZE // 2:
                 # Teleport to right side
-                self.px = (MAP_WIDTH - 1) * TILE_SIZE + TILE_SIZE // 2
+                self.px = (maze.MAP_WIDTH - 1) * TILE_SIZE + TILE_SIZE // 2
         
         # Check if at right tunnel entrance and moving right
-        elif current_x == MAP_WIDTH - 1 and self.dx > 0:
+        elif current_x == maze.MAP_WIDTH - 1 and self.dx > 0:
             # When we reach the right side of the tile
             if pixel_in_tile > TILE_SIZE // 2:
                 # Teleport to left side
                 self.px = TILE_SIZE+10 // 2
 
-    def draw(self):
-        """Draw Pacman and pallet_count text in the top tile"""
-        # Lazily initialize font once
-        global font
-        if font is None:
-            try:
-                if not pygame.font.get_init():
-                    pygame.font.init()
-                font_path = resource_path("src", "fonts", "CascadiaCode-VariableFont_wght.ttf")
-                font = pygame.font.Font(font_path, 22)
-            except Exception as e:
-                print("Font init failed:", e)
-        # Calculate mouth opening
-        if self.dx == 0 and self.dy == 0:
-            # Closed mouth when stationary
-            mouth_angle = 0
-        else:
-            # Animated mouth (0-60 degrees)
-            mouth_angle = 30 + 30 * math.sin(self.mouth_phase)
+    def draw(self, alpha=1.0):
+        """Draw Pacman and pallet_count text in the top tile.
 
-        center_x = int(self.px)
-        center_y = int(self.py)
+        alpha interpolates between the last two simulation steps (see render_pos).
+        Returns the list of screen rects touched, for dirty-rect display updates.
+        """
+        render_x, render_y = self.render_pos(alpha)
+        center_x = int(render_x)
+        center_y = int(render_y)
 
-        # Determine direction for mouth
-        if self.dx == 1:  # Right
-            direction_angle = 0
-        elif self.dx == -1:  # Left
-            direction_angle = 180
-        elif self.dy == -1:  # Up
-            direction_angle = 90
-        elif self.dy == 1:  # Down
-            direction_angle = 270
+        frames = self._mouth_frames()
+        direction_index = DIRECTION_FRAME_INDEX.get((self.dx, self.dy))
+        if direction_index is None:
+            # Stationary - full circle (last frame)
+            frame = frames[-1]
         else:
-            # Stationary - draw full circle
-            pygame.draw.circle(screen, (255, 255, 0), (center_x, center_y), self.radius)
-            # Render dynamic pallet_count in the top-left tile
-            if font:
-                title_surface = font.render(str(self.pallet_count), True, (0, 255, 0))
-                screen.blit(title_surface, (0, 0))
-            return
-
-        # Draw Pacman as a filled arc (pie slice)
-        points = []
-        num_points = 30
-
-        # Start at center
-        points.append((center_x, center_y))
-
-        # Calculate the large arc (the Pacman body, not the mouth)
-        start_angle = direction_angle + mouth_angle / 2
-        end_angle = direction_angle - mouth_angle / 2 + 360
-
-        # Convert to radians
-        start_rad = math.radians(start_angle)
-        end_rad = math.radians(end_angle)
-
-        # Generate points along the arc
-        for i in range(num_points + 1):
-            t = i / num_points
-            angle = start_rad + (end_rad - start_rad) * t
-
-            x = center_x + self.radius * math.cos(angle)
-            y = center_y - self.radius * math.sin(angle)  # Negative because pygame y increases downward
-
-            points.append((x, y))
+            # Nearest pre-rendered phase
+            phase_index = round(self.mouth_phase / (2 * math.pi) * MOUTH_FRAMES) % MOUTH_FRAMES
+            frame = frames[direction_index * MOUTH_FRAMES + phase_index]
+        offset = self.radius + 1
+        dirty = [maze.screen.blit(frame, (center_x - offset, center_y - offset))]
+        dirty.append(self._draw_score())
+        return dirty
 
-        # Draw the filled polygon
-        pygame.draw.polygon(screen, (255, 255, 0), points)
+    def _mouth_frames(self):
+        """Pre-rendered bodies: 4 directions x MOUTH_FRAMES mouth phases, then the closed circle."""
+        if self._frames is None:
+            self._frames = get_frames(("pacman", self.radius, MOUTH_FRAMES),
+                                      lambda: build_mouth_frames(self.radius))
+        return self._frames
 
-        # Render dynamic pallet_count in the top-left tile each frame
-        if font:
-            title_surface = font.render(str(self.pallet_count), True, (0, 255, 0))
-            screen.blit(title_surface, (0, 0))
+    def _draw_score(self):
+        """Draw pallet_count in the top-left tile (re-rendered only when it changes)."""
+        score_surface = render_text(get_font(22), str(self.pallet_count), (0, 255, 0))
+        return maze.screen.blit(score_surface, (0, 0))
@@ -0,0 +1,166 @@
+# profiler.py
+"""Opt-in frame-time instrumentation.
+
+Code on the hot path brackets a stage with mark()/add():
+
+    t0 = PROFILER.mark()
+    pacman.update()
+    PROFILER.add("pacman", t0)
+
+While disabled both calls return immediately, so instrumentation can stay in place.
+When enabled, stage times are summed per frame, kept in a rolling window for the
+on-screen overlay (p50/p99/max per stage), and optionally streamed to a JSON-lines
+file (one record per frame) for offline analysis.
+"""
+import atexit
+import json
+import time
+from collections import deque
+
+import pygame
+
+from text import get_font, render_text
+
+
+class FrameProfiler:
+    def __init__(self, window: int = 300, refresh_every: int = 30):
+        self.enabled = False
+        self.window = window
+        # Overlay stats are recomputed every `refresh_every` frames, not every frame
+        self.refresh_every = refresh_every
+        self.frame_index = 0
+        self._current = {}
+        self._history = {}
+        self._frame_start = 0.0
+        self._dump = None
+        self._font = None
+        self._overlay = None
+        self._overlay_age = 0
+
+    def enable(self, dump_path=None):
+        """Start collecting; if dump_path is given, append one JSON line per frame to it."""
+        self.enabled = True
+        if dump_path and self._dump is None:
+            self._dump = open(dump_path, "a", encoding="utf-8")
+            atexit.register(self.close)
+
+    def close(self):
+        if self._dump is not None:
+            self._dump.close()
+            self._dump = None
+
+    def mark(self) -> float:
+        """Current timestamp when enabled (0.0 otherwise); pass it to add()."""
+        if not self.enabled:
+            return 0.0
+        return time.perf_counter()
+
+    def add(self, stage: str, since: float) -> float:
+        """Charge the time since `since` to a stage of the current frame; returns a new mark."""
+        if not self.enabled:
+            return 0.0
+        now = time.perf_counter()
+        self._current[stage] = self._current.get(stage, 0.0) + (now - since)
+        return now
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._current = {}
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Close the current frame: record a 'total' stage, roll history, dump the record."""
+        if not self.enabled:
+            return
+        self._current["total"] = time.perf_counter() - self._frame_start
+        for stage, seconds in self._current.items():
+            history = self._history.get(stage)
+            if history is None:
+                history = self._history[stage] = deque(maxlen=self.window)
+            history.append(seconds)
+        if self._dump is not None:
+            record = {"frame": self.frame_index,
+                      "ms": {stage: round(seconds * 1000, 4) for stage, seconds in self._current.items()}}
+            self._dump.write(json.dumps(record) + "\n")
+        self.frame_index += 1
+
+    def stats(self) -> dict:
+        """Return {stage: (p50_ms, p99_ms, max_ms)} over the rolling window."""
+        result = {}
+        for stage, history in self._history.items():
+            samples = sorted(history)
+            n = len(samples)
+            p50 = samples[n // 2]
+            p99 = samples[min(n - 1, int(n * 0.99))]
+            result[stage] = (p50 * 1000, p99 * 1000, samples[-1] * 1000)
+        return result
+
+    def _render_overlay(self):
+        if self._font is None:
+            self._font = get_font(13)
+        stats = self.stats()
+        # Keep the frame total last so it is easy to find
+        stages = sorted(stats, key=lambda s: (s == "total", s))
+        lines = [f"{'stage':<20}{'p50':>7}{'p99':>7}{'max':>7}  ms"]
+        for stage in stages:
+            p50, p99, worst = stats[stage]
+            lines.append(f"{stage:<20}{p50:7.2f}{p99:7.2f}{worst:7.2f}")
+        rendered = [self._font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(s.get_width() for s in rendered) + 8
+        height = sum(s.get_height() for s in rendered) + 8
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        y = 4
+        for surf in rendered:
+            overlay.blit(surf, (4, y))
+            y += surf.get_height()
+        self._overlay = overlay
+
+    def draw_overlay(self, surface, pos=(4, 24)):
+        """Draw the rolling per-stage stats; returns the list of screen rects touched."""
+        if not self.enabled or not self._history:
+            return []
+        self._overlay_age += 1
+        if self._overlay is None or self._overlay_age >= self.refresh_every:
+            self._render_overlay()
+            self._overlay_age = 0
+        return [surface.blit(self._overlay, pos)]
+
+
+class FrameRateReadout:
+    """Small always-on FPS / frame-time line (swarm mode), refreshed every `refresh_every` frames."""
+
+    def __init__(self, label="", refresh_every: int = 30):
+        self.label = label
+        self.refresh_every = refresh_every
+        self._frames = 0
+        self._work = 0.0
+        self._worst = 0.0
+        self._surface = None
+
+    def add_frame(self, work_seconds: float, fps: float):
+        """Record one frame's work time (simulation + drawing, not the frame cap wait)."""
+        self._frames += 1
+        self._work += work_seconds
+        self._worst = max(self._worst, work_seconds)
+        if self._surface is None or self._frames >= self.refresh_every:
+            avg_ms = self._work / self._frames * 1000
+            text = f"{fps:4.0f} fps  {avg_ms:5.2f} ms avg  {self._worst * 1000:5.2f} ms max  {self.label}"
+            rendered = render_text(get_font(14), text, (255, 255, 0))
+            # Dark backing so the line stays readable over walls and sprites
+            self._surface = pygame.Surface((rendered.get_width() + 8, rendered.get_height() + 2))
+            self._surface.blit(rendered, (4, 1))
+            self._frames = 0
+            self._work = 0.0
+            self._worst = 0.0
+
+    def draw(self, surface, pos):
+        """Draw the readout; returns the list of screen rects touched."""
+        if self._surface is None:
+            return []
+        return [surface.blit(self._surface, pos)]
+
+
+# Shared instance used by the game loop and actors
+PROFILER = FrameProfiler()
@@ -0,0 +1,218 @@
+# replay.py
+"""Record game sessions as compact input logs and replay them deterministically.
+
+A session is fully determined by its seed, starting maze, ghost speed, starting
+lives and the direction keys Pacman received at each simulation step (game logic
+runs on a fixed timestep with a simulated clock, see main.SIM_HZ), so that is all
+the log stores:
+
+    header   "<4sHqHdH"  magic b"PMR1", version, seed, maze key, ghost speed, lives
+    events   varint((step_delta << 3) | code), code 0-3 = up/down/left/right
+    trailer  varint((step_delta << 3) | END) + "<Iihh" steps, score, lives, level
+
+Events are written as they happen through a buffered file, so memory use does not
+grow with session length; a log cut short by a crash replays up to its last event.
+
+Usage:
+    PACMAN_RECORD=recordings python src/main.py      # record every game to a directory
+    python src/replay.py recordings/session-....pmr  # replay headlessly, check the result
+    python src/replay.py session.pmr --render --speed 4
+"""
+import argparse
+import os
+import struct
+import sys
+import time
+
+import pygame
+
+MAGIC = b"PMR1"
+VERSION = 1
+_HEADER = struct.Struct("<4sHqHdH")
+_TRAILER = struct.Struct("<Iihh")
+END = 7
+# Direction key code <-> 2-bit event code
+DIRECTION_CODES = {pygame.K_UP: 0, pygame.K_DOWN: 1, pygame.K_LEFT: 2, pygame.K_RIGHT: 3}
+CODE_KEYS = {code: key for key, code in DIRECTION_CODES.items()}
+
+
+def _write_varint(f, value):
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    f.write(out)
+
+
+def _read_varint(f):
+    value = 0
+    shift = 0
+    while True:
+        b = f.read(1)
+        if not b:
+            return None
+        value |= (b[0] & 0x7F) << shift
+        if b[0] < 0x80:
+            return value
+        shift += 7
+
+
+def _read_header(f, path):
+    header = f.read(_HEADER.size)
+    if len(header) != _HEADER.size:
+        raise ValueError(f"{path}: truncated replay header")
+    magic, version, seed, maze_key, ghost_speed, initial_lives = _HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: not a compatible replay log")
+    return {"seed": seed, "maze_key": str(maze_key), "ghost_speed": ghost_speed, "initial_lives": initial_lives}
+
+
+def read_log_header(path) -> dict:
+    """Session settings (seed, maze_key, ghost_speed, initial_lives) of a log."""
+    with open(path, "rb") as f:
+        return _read_header(f, path)
+
+
+class InputRecorder:
+    """Stream one session's seed and direction inputs to a log file."""
+
+    def __init__(self, path, seed, maze_key, ghost_speed, initial_lives):
+        self.path = path
+        self._f = open(path, "wb")
+        self._f.write(_HEADER.pack(MAGIC, VERSION, seed, int(maze_key), ghost_speed, initial_lives))
+        self._last_step = 0
+
+    def record(self, step, key):
+        """Log a key press applied before simulation step `step`; non-direction keys are ignored."""
+        code = DIRECTION_CODES.get(key)
+        if code is None or self._f is None:
+            return
+        _write_varint(self._f, ((step - self._last_step) << 3) | code)
+        self._last_step = step
+
+    def close(self, steps, score, lives, level):
+        """Write the trailer (final state, used to verify replays) and close the log."""
+        if self._f is None:
+            return
+        _write_varint(self._f, ((steps - self._last_step) << 3) | END)
+        self._f.write(_TRAILER.pack(steps, score, lives, level))
+        self._f.close()
+        self._f = None
+
+
+class InputReplayer:
+    """Read a session log lazily and hand out the keys due at each simulation step."""
+
+    def __init__(self, path):
+        self.path = path
+        self._f = open(path, "rb")
+        header = _read_header(self._f, path)
+        self.seed = header["seed"]
+        self.maze_key = header["maze_key"]
+        self.ghost_speed = header["ghost_speed"]
+        self.initial_lives = header["initial_lives"]
+        # Final state from the trailer, once it has been read (None for truncated logs)
+        self.expected = None
+        self._step = 0
+        self._pending = None
+        self._done = False
+        self._advance()
+
+    def _advance(self):
+        """Read the next event into self._pending as (step, key), or finish."""
+        value = _read_varint(self._f)
+        if value is None:
+            self._finish()
+            return
+        self._step += value >> 3
+        code = value & 0x7
+        if code == END:
+            trailer = self._f.read(_TRAILER.size)
+            if len(trailer) == _TRAILER.size:
+                steps, score, lives, level = _TRAILER.unpack(trailer)
+                self.expected = {"steps": steps, "score": score, "lives": lives, "level": level}
+            self._finish()
+            return
+        self._pending = (self._step, CODE_KEYS[code])
+
+    def _finish(self):
+        self._pending = None
+        self._done = True
+        self._f.close()
+
+    def keys_for_step(self, step):
+        """Keys recorded before simulation step `step` (call with increasing steps)."""
+        keys = []
+        while self._pending is not None and self._pending[0] <= step:
+            keys.append(self._pending[1])
+            self._advance()
+        return keys
+
+    def finished(self, step) -> bool:
+        """True once every event has been consumed and the recorded session length reached."""
+        if not self._done:
+            return False
+        end = self.expected["steps"] if self.expected else self._step
+        return step >= end
+
+    def check(self, result) -> bool:
+        """Compare a replay's score/lives/level with the recorded trailer; prints any mismatch."""
+        if self.expected is None:
+            print("Replay log has no trailer (session did not end cleanly); nothing to compare")
+            return True
+        mismatches = [f"{k}: recorded {self.expected[k]}, replayed {result[k]}"
+                      for k in ("score", "lives", "level") if self.expected[k] != result[k]]
+        for line in mismatches:
+            print("Replay mismatch -", line)
+        return not mismatches
+
+
+def new_recording_path(directory):
+    """A fresh session file name inside directory (created if needed)."""
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(directory, f"session-{stamp}-{os.getpid()}-{time.perf_counter_ns() % 10**6:06d}.pmr")
+
+
+def replay_headless(path):
+    """Replay a log without a window as fast as possible; returns (result, matches)."""
+    import headless
+
+    replayer = InputReplayer(path)
+    game = headless.HeadlessGame(ghost_speed=replayer.ghost_speed, initial_lives=replayer.initial_lives,
+                                 seed=replayer.seed, maze_key=replayer.maze_key)
+    key_directions = {key: name for name, key in headless.DIRECTION_KEYS.items()}
+    while not replayer.finished(game.frame) and not game.is_over():
+        keys = replayer.keys_for_step(game.frame)
+        # handle_input keeps only the last direction, as in the live game
+        game.step(key_directions[keys[-1]] if keys else None)
+    result = game.result()
+    return result, replayer.check(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded Pacman session.")
+    parser.add_argument("log", help="session log written with PACMAN_RECORD")
+    parser.add_argument("--render", action="store_true", help="replay in a window instead of headlessly")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed multiplier when rendering")
+    args = parser.parse_args()
+
+    if not args.render:
+        start = time.perf_counter()
+        result, ok = replay_headless(args.log)
+        print(result)
+        print(f"Replayed {result['frames']} steps in {time.perf_counter() - start:.2f}s")
+        return 0 if ok else 1
+
+    import maze
+    import main as game_main
+    pygame.init()
+    # Start on the recorded maze (the window is sized for it)
+    maze.init(read_log_header(args.log)["maze_key"])
+    result = game_main.run_game(replayer=InputReplayer(args.log), speed=args.speed)
+    return 0 if result == "REPLAY_OK" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
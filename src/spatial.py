@@ -0,0 +1,71 @@
+"""Tile-bucketed spatial index for actors.
+
+Each actor key is filed under the tile it stands on, and moving an actor only
+touches the two buckets involved. A range query visits the (2n + 1)^2 buckets
+around a tile, so its cost depends on the radius and on the actors found there,
+not on how many actors are indexed.
+"""
+
+
+class TileBuckets:
+    def __init__(self):
+        # tile -> set of keys standing on it
+        self._buckets = {}
+        # key -> tile it is filed under
+        self._tiles = {}
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def place(self, key, tile):
+        """File key under tile, moving it out of its previous bucket."""
+        old = self._tiles.get(key)
+        if old == tile:
+            return
+        if old is not None:
+            bucket = self._buckets[old]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[old]
+        self._buckets.setdefault(tile, set()).add(key)
+        self._tiles[key] = tile
+
+    def remove(self, key):
+        tile = self._tiles.pop(key, None)
+        if tile is not None:
+            bucket = self._buckets[tile]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[tile]
+
+    def tile_of(self, key):
+        return self._tiles.get(key)
+
+    def _buckets_within(self, tile, n):
+        tx, ty = tile
+        if (2 * n + 1) ** 2 > len(self._buckets):
+            # Radius covers more tiles than there are occupied ones: scan those instead
+            for (x, y), bucket in self._buckets.items():
+                if abs(x - tx) <= n and abs(y - ty) <= n:
+                    yield bucket
+            return
+        buckets = self._buckets
+        for y in range(ty - n, ty + n + 1):
+            for x in range(tx - n, tx + n + 1):
+                bucket = buckets.get((x, y))
+                if bucket:
+                    yield bucket
+
+    def within(self, tile, n):
+        """Sorted keys standing at most n tiles from tile on both axes."""
+        keys = []
+        for bucket in self._buckets_within(tile, n):
+            keys.extend(bucket)
+        keys.sort()
+        return keys
+
+    def any_within(self, tile, n):
+        """True if any key stands at most n tiles from tile on both axes."""
+        for _ in self._buckets_within(tile, n):
+            return True
+        return False
@@ -0,0 +1,263 @@
+# store.py
+"""Player account and high score storage.
+
+The menu talks to a store object rather than to files, so the backend can be
+swapped (PACMAN_STORE=sqlite|json, default sqlite):
+
+    SQLiteStore  pacman.db in the data dir: WAL journal, one transaction per
+                 write, an index on the score column for top-N queries. On first
+                 use it imports the existing user.json/score.json (or the bundled
+                 defaults) once.
+    JsonStore    the original user.json/score.json files, rewritten on change.
+"""
+import json
+import os
+import sqlite3
+
+
+class JsonStore:
+    """Users and best scores kept in memory and saved to two JSON files."""
+
+    def __init__(self, user_file, score_file, default_user_file=None, default_score_file=None):
+        self.user_file = user_file
+        self.score_file = score_file
+        self.users = _load_json(user_file, default_user_file)
+        self.scores = _load_json(score_file, default_score_file)
+
+    def get_password(self, username):
+        return self.users.get(username)
+
+    def add_user(self, username, password) -> bool:
+        """Create an account; False if the name is taken or saving failed."""
+        if username in self.users:
+            return False
+        self.users[username] = password
+        if not _save_json(self.user_file, self.users):
+            del self.users[username]
+            return False
+        return True
+
+    def get_score(self, username) -> int:
+        return self.scores.get(username, 0)
+
+    def submit_score(self, username, score) -> bool:
+        """Keep score if it beats the player's best; returns True if it did."""
+        if score <= self.scores.get(username, 0):
+            return False
+        self.scores[username] = score
+        _save_json(self.score_file, self.scores)
+        return True
+
+    def top_scores(self, limit=10):
+        """[(username, score)] best first."""
+        # Same order as the SQLite store: ties by username
+        return sorted(self.scores.items(), key=_rank_key)[:limit]
+
+    def user_count(self) -> int:
+        return len(self.users)
+
+    def score_count(self) -> int:
+        return len(self.scores)
+
+    def close(self):
+        pass
+
+
+class SQLiteStore:
+    """Users and best scores in an indexed SQLite database."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (username TEXT PRIMARY KEY, password TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS scores (username TEXT PRIMARY KEY, best INTEGER NOT NULL);
+        CREATE INDEX IF NOT EXISTS scores_by_best ON scores (best DESC);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        # WAL: readers don't block the writer and a crash mid-write can't corrupt the file
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(self.SCHEMA)
+
+    def migrate_from_json(self, sources):
+        """Import users/scores from JSON files once; sources is a list of (user_file, score_file) to try in order."""
+        if self._conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+            return
+        users, scores = {}, {}
+        for user_file, score_file in sources:
+            if (user_file and os.path.exists(user_file)) or (score_file and os.path.exists(score_file)):
+                users = _read_json(user_file)
+                scores = _read_json(score_file)
+                print(f"Migrating players from {user_file} and {score_file}")
+                break
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)",
+                                   [(str(u), str(p)) for u, p in users.items()])
+            self._conn.executemany(
+                "INSERT INTO scores (username, best) VALUES (?, ?) "
+                "ON CONFLICT (username) DO UPDATE SET best = MAX(best, excluded.best)",
+                [(str(u), int(s)) for u, s in scores.items()])
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', '1')")
+
+    def get_password(self, username):
+        row = self._conn.execute("SELECT password FROM users WHERE username = ?", (username,)).fetchone()
+        return row[0] if row else None
+
+    def add_user(self, username, password) -> bool:
+        """Create an account; False if the name is taken or saving failed."""
+        try:
+            with self._conn:
+                cur = self._conn.execute("INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)",
+                                         (username, password))
+            return cur.rowcount == 1
+        except sqlite3.Error as e:
+            print(f"Error saving user {username}: {e}")
+            return False
+
+    def get_score(self, username) -> int:
+        row = self._conn.execute("SELECT best FROM scores WHERE username = ?", (username,)).fetchone()
+        return row[0] if row else 0
+
+    def submit_score(self, username, score) -> bool:
+        """Keep score if it beats the player's best; returns True if it did."""
+        try:
+            with self._conn:
+                cur = self._conn.execute(
+                    "INSERT INTO scores (username, best) VALUES (?, ?) "
+                    "ON CONFLICT (username) DO UPDATE SET best = excluded.best WHERE excluded.best > best",
+                    (username, score))
+            return cur.rowcount == 1
+        except sqlite3.Error as e:
+            print(f"Error saving score for {username}: {e}")
+            return False
+
+    def top_scores(self, limit=10):
+        """[(username, score)] best first (served from the score index)."""
+        return self._conn.execute(
+            "SELECT username, best FROM scores ORDER BY best DESC, username LIMIT ?", (limit,)).fetchall()
+
+    def user_count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def score_count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+
+def _rank_key(entry):
+    """Leaderboard order of a (username, score) entry: best score first, ties by username."""
+    return -entry[1], entry[0]
+
+
+class Leaderboard:
+    """Top-N (username, score) list kept in memory and updated as scores are submitted.
+
+    The store is queried on first use and on reload(); in between, a submitted
+    personal best only touches this N-entry list. `version` changes whenever the
+    visible ranking changes, so callers can cache anything derived from it.
+    """
+
+    def __init__(self, store, size=10):
+        self.store = store
+        self.size = size
+        self.version = 0
+        self._entries = None
+
+    def entries(self):
+        """[(username, score)] best first."""
+        if self._entries is None:
+            self._entries = [tuple(row) for row in self.store.top_scores(self.size)]
+        return self._entries
+
+    def reload(self):
+        """Re-read the ranking from the store, which other processes may have written to."""
+        entries = [tuple(row) for row in self.store.top_scores(self.size)]
+        if entries != self._entries:
+            self._entries = entries
+            self.version += 1
+
+    def submit(self, username, score) -> bool:
+        """Record score as the player's best if it beats it; returns True if it did."""
+        if not self.store.submit_score(username, score):
+            return False
+        entries = self.entries()
+        ranked = [entry for entry in entries if entry[0] != username]
+        entry = (username, score)
+        # Compare on the full ranking key: a tie with an earlier username still ranks higher
+        if len(ranked) < self.size or _rank_key(entry) < _rank_key(ranked[-1]):
+            ranked.append(entry)
+            ranked.sort(key=_rank_key)
+            del ranked[self.size:]
+        if ranked != entries:
+            self._entries = ranked
+            self.version += 1
+        return True
+
+
+def open_store(data_dir, default_user_file=None, default_score_file=None, backend=None):
+    """Open the configured store in data_dir, falling back to JSON files if SQLite is unavailable."""
+    backend = backend or os.environ.get("PACMAN_STORE", "sqlite")
+    user_file = os.path.join(data_dir, "user.json")
+    score_file = os.path.join(data_dir, "score.json")
+    if backend == "sqlite":
+        try:
+            store = SQLiteStore(os.path.join(data_dir, "pacman.db"))
+            store.migrate_from_json([(user_file, score_file), (default_user_file, default_score_file)])
+            print(f"Player database: {store.db_path}")
+            return store
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error opening player database ({e}); using JSON files")
+    print(f"User file: {user_file}")
+    print(f"Score file: {score_file}")
+    return JsonStore(user_file, score_file, default_user_file, default_score_file)
+
+
+def _read_json(filepath):
+    if not filepath or not os.path.exists(filepath):
+        return {}
+    try:
+        with open(filepath, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading {filepath}: {e}")
+        return {}
+
+
+def _load_json(filepath, default_path=None):
+    """Load JSON data from file, seeding from a bundled default if present."""
+    try:
+        if os.path.exists(filepath):
+            with open(filepath, 'r') as f:
+                data = json.load(f)
+                return data
+        else:
+            seed_data = {}
+            if default_path and os.path.exists(default_path):
+                try:
+                    with open(default_path, 'r') as default_f:
+                        seed_data = json.load(default_f)
+                except Exception as e:
+                    print(f"Failed to read default data from {default_path}: {e}")
+            print(f"File {filepath} doesn't exist, creating from defaults")
+            with open(filepath, 'w') as f:
+                json.dump(seed_data, f)
+            return seed_data
+    except Exception as e:
+        print(f"Error loading {filepath}: {e}")
+        return {}
+
+
+def _save_json(filepath, data):
+    """Save JSON data to file"""
+    try:
+        with open(filepath, 'w') as f:
+            json.dump(data, f, indent=4)
+        return True
+    except Exception as e:
+        print(f"Error saving {filepath}: {e}")
+        return False
@@ -0,0 +1,72 @@
+# text.py
+"""Shared font registry and rendered-text cache.
+
+Fonts are loaded once per (file, size) and text surfaces are cached by
+(font, text, color, antialias) with LRU eviction, so HUD labels and menu text
+are only rendered again when their value changes.
+
+    surf = render_text(get_font(22), str(score), (0, 255, 0))
+
+Cached surfaces are shared: blit them, don't draw on them.
+"""
+from collections import OrderedDict
+
+import pygame
+
+from paths import resource_path
+
+GAME_FONT = "CascadiaCode-VariableFont_wght.ttf"
+# Rendered surfaces kept before the least recently used ones are dropped
+TEXT_CACHE_SIZE = 256
+
+_fonts = {}
+
+
+def get_font(size: int, name=GAME_FONT):
+    """Font from src/fonts/<name> at size (name None = pygame's default font), loaded once."""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        try:
+            path = resource_path("src", "fonts", name) if name is not None else None
+            font = pygame.font.Font(path, size)
+        except Exception as e:
+            print(f"Font {name} ({size}) failed to load, using system font:", e)
+            font = pygame.font.SysFont(None, size)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    """Rendered text surface from the shared cache (rendered on first use)."""
+    return TEXT_CACHE.render(font, text, color, antialias)
@@ -0,0 +1,60 @@
+# tilegrid.py
+"""Maze grid backed by one contiguous bytearray (one byte per tile, row-major).
+
+TileGrid is a list of per-row memoryviews over that buffer, so the existing
+`grid[y][x]` reads and writes work unchanged (and still index at C speed), while
+whole-grid operations act on the buffer directly: a reset or maze switch is a
+single slice copy, and counts/searches use bytearray.count/find instead of
+nested Python loops.
+"""
+
+
+class TileGrid(list):
+    def __init__(self, width: int, height: int, data=None):
+        super().__init__()
+        self.reshape(width, height, data)
+
+    def reshape(self, width: int, height: int, data=None):
+        """Replace the grid in place with a new size (and data, else all zero)."""
+        buffer = bytearray(data) if data is not None else bytearray(width * height)
+        if len(buffer) != width * height:
+            raise ValueError(f"Grid data has {len(buffer)} tiles, expected {width}x{height}")
+        view = memoryview(buffer)
+        self[:] = [view[r * width:(r + 1) * width] for r in range(height)]
+        self.width = width
+        self.height = height
+        self.buffer = buffer
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a grid from a list of equal-length rows of ints."""
+        height = len(rows)
+        width = len(rows[0]) if height > 0 else 0
+        return cls(width, height, b"".join(bytes(row) for row in rows))
+
+    def load(self, data):
+        """Overwrite every tile from a same-sized buffer (bytes, memoryview or TileGrid)."""
+        if isinstance(data, TileGrid):
+            data = data.buffer
+        if len(data) != len(self.buffer):
+            raise ValueError("Grid size mismatch")
+        # Same-length slice assignment: the row views stay valid
+        self.buffer[:] = data
+
+    def copy(self):
+        return TileGrid(self.width, self.height, self.buffer)
+
+    def count_tiles(self, value: int) -> int:
+        """Number of tiles holding value."""
+        return self.buffer.count(value)
+
+    def positions(self, value: int):
+        """(x, y) of every tile holding value, in row-major order."""
+        buffer = self.buffer
+        width = self.width
+        found = []
+        i = buffer.find(value)
+        while i != -1:
+            found.append((i % width, i // width))
+            i = buffer.find(value, i + 1)
+        return found